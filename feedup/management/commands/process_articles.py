@@ -16,8 +16,9 @@ class Command(BaseCommand):
         
         success_count = 0
         
-        # Process each article in its own transaction
-        for staged_article in articles_to_process:
+        # Process each article in its own transaction, streaming rows in chunks
+        # and skipping raw_content since it is never copied to Article
+        for staged_article in articles_to_process.defer('raw_content').iterator(chunk_size=200):
             try:
                 with transaction.atomic():
                     # Check if article with this URL already exists
@@ -27,7 +28,7 @@ class Command(BaseCommand):
                         ))
                         # Mark as processed anyway since we don't need to process it again
                         staged_article.processed = True
-                        staged_article.save()
+                        staged_article.save(update_fields=['processed'])
                         continue
                         
                     # Create the Article record
@@ -43,7 +44,7 @@ class Command(BaseCommand):
                     
                     # Mark as processed
                     staged_article.processed = True
-                    staged_article.save()
+                    staged_article.save(update_fields=['processed'])
                     
                     success_count += 1
                     
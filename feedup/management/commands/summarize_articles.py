@@ -7,7 +7,11 @@ class Command(BaseCommand):
     help = "Use Gemini to summarize approved tech articles"
 
     def handle(self, *args, **kwargs):
-        articles = ArticleStaging.objects.filter(approved=True, ai_generated=False)
+        articles = (
+            ArticleStaging.objects.filter(approved=True, ai_generated=False)
+            .only('id', 'title', 'raw_content')
+            .iterator(chunk_size=200)
+        )
         count = 0
         for article in articles:
             success, error = summarize_articles(article)
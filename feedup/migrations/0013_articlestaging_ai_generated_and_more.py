@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-15 22:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedup', '0012_researchupdate_search_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articlestaging',
+            name='ai_generated',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='articlestaging',
+            index=models.Index(fields=['processed', 'approved', 'ai_generated'], name='stg_flags_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='articlestaging',
+            index=models.Index(condition=models.Q(('ai_generated', False), ('approved', True)), fields=['id'], name='stg_pending_ai_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.6 on 2026-10-15 22:40
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+def copy_tags_to_array(apps, schema_editor):
+    ArticleStaging = apps.get_model('feedup', 'ArticleStaging')
+    batch = []
+    for article in ArticleStaging.objects.only('id', 'tag_suggestions').iterator(chunk_size=500):
+        tags = article.tag_suggestions if isinstance(article.tag_suggestions, list) else []
+        article.tag_suggestions_array = [str(tag).strip()[:64] for tag in tags if str(tag).strip()]
+        batch.append(article)
+        if len(batch) >= 500:
+            ArticleStaging.objects.bulk_update(batch, ['tag_suggestions_array'])
+            batch = []
+    if batch:
+        ArticleStaging.objects.bulk_update(batch, ['tag_suggestions_array'])
+
+
+def copy_tags_to_json(apps, schema_editor):
+    ArticleStaging = apps.get_model('feedup', 'ArticleStaging')
+    batch = []
+    for article in ArticleStaging.objects.only('id', 'tag_suggestions_array').iterator(chunk_size=500):
+        article.tag_suggestions = list(article.tag_suggestions_array or [])
+        batch.append(article)
+        if len(batch) >= 500:
+            ArticleStaging.objects.bulk_update(batch, ['tag_suggestions'])
+            batch = []
+    if batch:
+        ArticleStaging.objects.bulk_update(batch, ['tag_suggestions'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedup', '0013_articlestaging_ai_generated_and_more'),
+    ]
+
+    # jsonb cannot be cast to varchar[] in place, so copy through a temporary column.
+    operations = [
+        migrations.AddField(
+            model_name='articlestaging',
+            name='tag_suggestions_array',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=64), default=list, size=None),
+        ),
+        migrations.RunPython(copy_tags_to_array, copy_tags_to_json),
+        migrations.RemoveField(
+            model_name='articlestaging',
+            name='tag_suggestions',
+        ),
+        migrations.RenameField(
+            model_name='articlestaging',
+            old_name='tag_suggestions_array',
+            new_name='tag_suggestions',
+        ),
+    ]
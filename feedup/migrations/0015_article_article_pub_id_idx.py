@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-15 22:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedup', '0014_alter_articlestaging_tag_suggestions'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-published_at', '-id'], name='article_pub_id_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.6 on 2026-10-15 22:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedup', '0015_article_article_pub_id_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='conference',
+            name='feedup_conf_start_d_97d6df_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='researchupdate',
+            name='feedup_rese_publica_de7750_idx',
+        ),
+        migrations.AddIndex(
+            model_name='conference',
+            index=models.Index(fields=['start_date', 'id'], name='conf_start_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='researchupdate',
+            index=models.Index(fields=['-publication_date', '-id'], name='research_pub_id_idx'),
+        ),
+    ]
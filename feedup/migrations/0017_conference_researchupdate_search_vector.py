@@ -0,0 +1,43 @@
+# Generated by Django 5.1.6 on 2026-10-15 22:34
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedup', '0016_cursor_pagination_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='conference',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('title', 'description', 'location', 'topics', config='english'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddField(
+            model_name='researchupdate',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('title', 'summary', 'authors', config='english'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='conference',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='conf_search_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='conference',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['location'], name='conf_loc_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='conference',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['topics'], name='conf_topics_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='researchupdate',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='research_search_gin'),
+        ),
+    ]
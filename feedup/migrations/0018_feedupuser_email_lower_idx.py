@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-15 22:37
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedup', '0017_conference_researchupdate_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feedupuser',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='feedupuser_email_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.6 on 2026-10-15 22:37
+
+from django.db import migrations, models
+
+
+def drop_duplicate_otps(apps, schema_editor):
+    # Keep only the newest OTP per email so the unique constraint can be added
+    OTPVerification = apps.get_model('feedup', 'OTPVerification')
+    latest_ids = (
+        OTPVerification.objects.order_by('email', '-created_at', '-id')
+        .distinct('email')
+        .values('id')
+    )
+    OTPVerification.objects.exclude(id__in=latest_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedup', '0018_feedupuser_email_lower_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_otps, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='otpverification',
+            name='email',
+            field=models.EmailField(max_length=254, unique=True),
+        ),
+    ]
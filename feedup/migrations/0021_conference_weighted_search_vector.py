@@ -0,0 +1,33 @@
+# Generated by Django 5.1.6 on 2026-10-15 22:53
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedup', '0020_aijob'),
+    ]
+
+    # Generated columns can't be altered in place, so drop and re-add it with its index.
+    operations = [
+        migrations.RemoveIndex(
+            model_name='conference',
+            name='conf_search_gin',
+        ),
+        migrations.RemoveField(
+            model_name='conference',
+            name='search_vector',
+        ),
+        migrations.AddField(
+            model_name='conference',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('description', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), '||', django.contrib.postgres.search.SearchVector('location', config='english', weight='C'), django.contrib.postgres.search.SearchConfig('english')), '||', django.contrib.postgres.search.SearchVector('topics', config='english', weight='D'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='conference',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='conf_search_gin'),
+        ),
+    ]
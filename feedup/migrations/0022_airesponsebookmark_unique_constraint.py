@@ -0,0 +1,21 @@
+# Generated by Django 5.1.6 on 2026-10-15 23:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedup', '0021_conference_weighted_search_vector'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='airesponsebookmark',
+            name='unique_ai_bookmark_per_user',
+        ),
+        migrations.AddConstraint(
+            model_name='airesponsebookmark',
+            constraint=models.UniqueConstraint(fields=('user', 'original_article', 'question'), name='unique_ai_bookmark_per_user'),
+        ),
+    ]
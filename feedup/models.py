@@ -1,9 +1,14 @@
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.contrib.postgres.fields import ArrayField   
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from datetime import timedelta 
 import secrets
 import string
+import uuid
 import os
 from django.conf import settings
 import hashlib
@@ -14,7 +19,12 @@ class FeedUpUser(models.Model):
     password = models.CharField(max_length=128, null=True, blank=True) # For email/pass login
     google_id = models.CharField(max_length=128, unique=True, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-  
+
+    class Meta:
+        indexes = [
+            # Case-insensitive email lookups filter on LOWER(email)
+            models.Index(Lower('email'), name='feedupuser_email_lower_idx'),
+        ]
 
     # --- Add these properties to fix the AttributeError ---
     @property
@@ -30,20 +40,26 @@ class FeedUpUser(models.Model):
         return self.email
     
 class ArticleStaging(models.Model):
-    # ai_generated = models.BooleanField(default=False)  # True if generated by AI
     title = models.CharField(max_length=300)
     source_url = models.URLField(unique=True)
     source_name = models.CharField(max_length=50)
     raw_content = models.TextField()
-    tag_suggestions = models.JSONField(default=list)
+    tag_suggestions = ArrayField(models.CharField(max_length=64), default=list)
     published_at = models.DateTimeField()
     processed = models.BooleanField(default=False)
     approved = models.BooleanField(default=False)
     summary = models.TextField(blank=True, null=True)  # for TL;DR
     prompts = models.JSONField(default=list, blank=True)  # e.g. ["Explain X", "Try coding Y"]
+    ai_generated = models.BooleanField(default=False)  # True once Gemini has summarized it
 
     class Meta:
         ordering = ['-published_at']
+        indexes = [
+            # Serves the process_articles / summarize_articles flag filters
+            models.Index(fields=['processed', 'approved', 'ai_generated'], name='stg_flags_idx'),
+            # Hot path for summarize_articles: approved rows still waiting on AI
+            models.Index(fields=['id'], condition=Q(approved=True, ai_generated=False), name='stg_pending_ai_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.source_name})"
@@ -70,6 +86,10 @@ class Article(models.Model):
 
     class Meta:
         ordering = ['-published_at']
+        indexes = [
+            # Backs the cursor pagination ordering of the public article feed
+            models.Index(fields=['-published_at', '-id'], name='article_pub_id_idx'),
+        ]
 
     def __str__(self):
         return self.title    
@@ -93,9 +113,9 @@ class Bookmark(models.Model):
     
 class OTPVerification(models.Model):
     """
-    Stores OTPs for email verification.
+    Stores OTPs for email verification. One row per email; resending replaces it.
     """
-    email = models.EmailField()
+    email = models.EmailField(unique=True)
     otp = models.CharField(max_length=6)
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField()
@@ -133,6 +153,34 @@ class AiResponseBookmark(models.Model):
 
     def __str__(self):
         return f"Bookmark by {self.user.email} on article '{self.original_article.title}'"
+
+
+class AiJob(models.Model):
+    """
+    A background Ask AI request. The client polls it until the answer is ready.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    # Jobs run on the in-process pool, so a restart or redeploy loses pending ones;
+    # past this age a pending job is treated as failed
+    STALE_AFTER = timedelta(minutes=5)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(FeedUpUser, on_delete=models.CASCADE, related_name='ai_jobs')
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='ai_jobs')
+    query = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    answer = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"AI job {self.id} ({self.status})"
     
 
 class Conference(models.Model):
@@ -157,13 +205,29 @@ class Conference(models.Model):
     unique_hash = models.CharField(max_length=64, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    # Weighted full-text search document, kept up to date by Postgres
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config='english')
+            + SearchVector('description', weight='B', config='english')
+            + SearchVector('location', weight='C', config='english')
+            + SearchVector('topics', weight='D', config='english')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
     
     class Meta:
         ordering = ['start_date']
         indexes = [
-            models.Index(fields=['start_date']),
+            models.Index(fields=['start_date', 'id'], name='conf_start_id_idx'),
             models.Index(fields=['source', 'source_id']),
             models.Index(fields=['unique_hash']),
+            GinIndex(fields=['search_vector'], name='conf_search_gin'),
+            # Trigram indexes let the location/topic icontains filters use an index
+            GinIndex(fields=['location'], opclasses=['gin_trgm_ops'], name='conf_loc_trgm'),
+            GinIndex(fields=['topics'], opclasses=['gin_trgm_ops'], name='conf_topics_trgm'),
         ]
     
     def __str__(self):
@@ -197,13 +261,21 @@ class ResearchUpdate(models.Model):
     unique_hash = models.CharField(max_length=64, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    # Full-text search document, kept up to date by Postgres
+    search_vector = models.GeneratedField(
+        expression=SearchVector('title', 'summary', 'authors', config='english'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
     
     class Meta:
         ordering = ['-publication_date']
         indexes = [
-            models.Index(fields=['-publication_date']),
+            models.Index(fields=['-publication_date', '-id'], name='research_pub_id_idx'),
             models.Index(fields=['source', 'source_id']),
             models.Index(fields=['unique_hash']),
+            GinIndex(fields=['search_vector'], name='research_search_gin'),
         ]
     
     def __str__(self):
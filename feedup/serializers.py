@@ -40,6 +40,14 @@ class ArticleSerializer(serializers.ModelSerializer):
             "published_at",
         ]
 
+class ArticleListSerializer(ArticleSerializer):
+    # Only for querysets annotated with is_bookmarked (article list, bookmark list);
+    # False for anonymous readers, whose list is not annotated
+    is_bookmarked = serializers.BooleanField(read_only=True, default=False)
+
+    class Meta(ArticleSerializer.Meta):
+        fields = ArticleSerializer.Meta.fields + ["is_bookmarked"]
+
 class BookmarkSerializer(serializers.ModelSerializer):
     # Nest the article details within the bookmark
     article = ArticleSerializer(read_only=True)
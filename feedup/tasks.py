@@ -0,0 +1,30 @@
+"""
+Background work for FeedUp views, run through uniBackend.background.enqueue.
+"""
+from django.conf import settings
+from django.core.mail import send_mail
+
+from .models import AiJob
+from .utils import generate_ai_answer
+
+
+def send_otp_email(email, otp_code):
+    send_mail(
+        subject="Your FeedUp verification code",
+        message=f"Your OTP is: {otp_code}. It expires in 10 minutes.",
+        from_email=settings.EMAIL_HOST_USER,
+        recipient_list=[email],
+        fail_silently=False,
+    )
+
+
+def answer_ai_job(job_id):
+    job = AiJob.objects.select_related('article').get(id=job_id)
+    try:
+        job.answer = generate_ai_answer(job.article, job.query)
+        job.status = AiJob.STATUS_DONE
+    except Exception:
+        job.status = AiJob.STATUS_FAILED
+        raise
+    finally:
+        job.save(update_fields=['answer', 'status'])
@@ -0,0 +1,145 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import AiJob, Article, Bookmark, FeedUpUser
+from .tasks import answer_ai_job
+
+
+def make_article(n, **kwargs):
+    return Article.objects.create(
+        title=f"Article {n}",
+        source_url=f"https://example.com/articles/{n}",
+        source_name="example",
+        summary="summary",
+        published_at=timezone.now() - timedelta(days=n),
+        **kwargs,
+    )
+
+
+def bearer(email, user_type):
+    token = AccessToken()
+    token['email'] = email
+    token['user_type'] = user_type
+    return f"Bearer {token}"
+
+
+class ArticleListViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = FeedUpUser.objects.create(email="reader@example.com")
+        self.saved = make_article(1)
+        self.other = make_article(2)
+        Bookmark.objects.create(user=self.user, article=self.saved)
+
+    def flags(self, response):
+        mine = {self.saved.id, self.other.id}
+        return {row['id']: row['is_bookmarked'] for row in response.data['results'] if row['id'] in mine}
+
+    def test_anonymous_reader_gets_unflagged_feed(self):
+        response = self.client.get(reverse('article-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.flags(response), {self.saved.id: False, self.other.id: False})
+
+    def test_feedup_user_gets_bookmark_flags(self):
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.user.email, 'feedup_user'))
+        response = self.client.get(reverse('article-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.flags(response), {self.saved.id: True, self.other.id: False})
+
+    def test_unipulse_token_without_feedup_user_reads_anonymously(self):
+        self.client.credentials(HTTP_AUTHORIZATION=bearer("student@example.com", 'student'))
+        response = self.client.get(reverse('article-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.flags(response), {self.saved.id: False, self.other.id: False})
+
+    def test_invalid_token_is_still_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+        response = self.client.get(reverse('article-list'))
+        self.assertEqual(response.status_code, 401)
+
+
+class BookmarkViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = FeedUpUser.objects.create(email="reader@example.com")
+        self.article = make_article(1)
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.user.email, 'feedup_user'))
+
+    def test_new_bookmark_is_201_and_repeat_is_200(self):
+        url = reverse('bookmark-list-create')
+        first = self.client.post(url, {'article_id': self.article.id}, format='json')
+        second = self.client.post(url, {'article_id': self.article.id}, format='json')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(Bookmark.objects.filter(user=self.user, article=self.article).count(), 1)
+
+    def test_malformed_article_id_is_404(self):
+        response = self.client.post(reverse('bookmark-list-create'), {'article_id': 'abc'}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+    def test_delete_removes_bookmark(self):
+        Bookmark.objects.create(user=self.user, article=self.article)
+        response = self.client.delete(f"{reverse('bookmark-list-create')}?article_id={self.article.id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Bookmark.objects.filter(user=self.user).exists())
+
+
+class BookmarkMissingArticleTests(TransactionTestCase):
+    # The FK check is deferred to commit, which only happens outside TestCase's wrapping transaction
+
+    def test_missing_article_is_404(self):
+        user = FeedUpUser.objects.create(email="reader@example.com")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=bearer(user.email, 'feedup_user'))
+        response = client.post(reverse('bookmark-list-create'), {'article_id': 999999}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Bookmark.objects.exists())
+
+
+class AiJobTests(TestCase):
+    def setUp(self):
+        self.user = FeedUpUser.objects.create(email="reader@example.com")
+        self.job = AiJob.objects.create(user=self.user, article=make_article(1), query="Why?")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.user.email, 'feedup_user'))
+
+    def poll(self):
+        return self.client.get(reverse('ask-ai-job', args=[self.job.id])).data
+
+    def test_fresh_pending_job_stays_pending(self):
+        self.assertEqual(self.poll()['status'], AiJob.STATUS_PENDING)
+
+    def test_stale_pending_job_is_failed(self):
+        AiJob.objects.filter(pk=self.job.pk).update(
+            created_at=timezone.now() - AiJob.STALE_AFTER - timedelta(seconds=1)
+        )
+        data = self.poll()
+        self.assertEqual(data['status'], AiJob.STATUS_FAILED)
+        self.assertIn('error', data)
+        self.assertEqual(AiJob.objects.get(pk=self.job.pk).status, AiJob.STATUS_FAILED)
+
+    def test_stale_done_job_keeps_its_answer(self):
+        AiJob.objects.filter(pk=self.job.pk).update(
+            status=AiJob.STATUS_DONE, answer="Because.",
+            created_at=timezone.now() - AiJob.STALE_AFTER - timedelta(seconds=1),
+        )
+        self.assertEqual(self.poll(), {'job_id': str(self.job.id), 'status': 'done', 'answer': "Because."})
+
+    def test_gemini_error_marks_job_failed(self):
+        with mock.patch('feedup.tasks.generate_ai_answer', side_effect=RuntimeError("quota")):
+            with self.assertRaises(RuntimeError):
+                answer_ai_job(self.job.id)
+        job = AiJob.objects.get(pk=self.job.pk)
+        self.assertEqual(job.status, AiJob.STATUS_FAILED)
+        self.assertEqual(job.answer, "")
+
+    def test_answer_marks_job_done(self):
+        with mock.patch('feedup.tasks.generate_ai_answer', return_value="Because."):
+            answer_ai_job(self.job.id)
+        self.assertEqual(self.poll()['answer'], "Because.")
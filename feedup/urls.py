@@ -7,7 +7,7 @@ from feedup.views import (
     FeedUpRegisterView, FeedUpLoginView,
     FeedUpSendOtpView, FeedUpVerifyOtpView,
     SyncUniPulseUserView, CheckUserView, SetFeedUpPasswordView, AskAiView, 
-    AiResponseBookmarkListView, AiResponseBookmarkToggleView,
+    AiJobStatusView, AiResponseBookmarkListView, AiResponseBookmarkToggleView,
     # Add our new viewsets
     ConferenceViewSet, ResearchUpdateViewSet
 )
@@ -40,6 +40,7 @@ urlpatterns = [
 
     # Add the new URL pattern for the Ask AI feature
     path("ask-ai/", AskAiView.as_view(), name="ask-ai"),
+    path("ask-ai/jobs/<uuid:job_id>/", AiJobStatusView.as_view(), name="ask-ai-job"),
 
     # Add the new URL patterns for AI bookmarks
     path("ai-bookmarks/", AiResponseBookmarkListView.as_view(), name="ai-bookmark-list"),
@@ -1,15 +1,27 @@
+import hashlib
 import json
 import google.generativeai as genai
 import os
+from django.core.cache import cache
 from .models import Article
 
-# Configure the Gemini API client
-try:
-    genai.configure(api_key=os.environ.get("GEMINI_API_KEY"))
-    MODEL = genai.GenerativeModel('models/gemini-2.5-flash')
-except Exception as e:
-    print(f"Could not configure Gemini API: {e}")
-    MODEL = None
+# Gemini client, created on first use and shared by every call in this process
+_MODEL = None
+
+
+def _model():
+    """
+    Returns the process-wide Gemini model, configuring the API client on first call.
+    Returns None if the client could not be configured.
+    """
+    global _MODEL
+    if _MODEL is None:
+        try:
+            genai.configure(api_key=os.environ.get("GEMINI_API_KEY"))
+            _MODEL = genai.GenerativeModel('models/gemini-2.5-flash')
+        except Exception as e:
+            print(f"Could not configure Gemini API: {e}")
+    return _MODEL
 
 SUMMARY_PROMPT_TEMPLATE = """
 Summarize the following article into a small paragraph or points as suitable. Then suggest at least one or two interactive coding tips or critical thinking prompts related to the topic.
@@ -17,14 +29,47 @@ Summarize the following article into a small paragraph or points as suitable. Th
 Article:
 """
 
+# Character budget for article context sent with Q&A prompts
+PROMPT_TITLE_LIMIT = 200
+PROMPT_SUMMARY_LIMIT = 1500
+
+
+# Generated questions are cached per article for a day
+QUESTIONS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _prompt_context(article):
+    """Returns the article title and summary trimmed to the prompt budget."""
+    return (article.title or '')[:PROMPT_TITLE_LIMIT], (article.summary or '')[:PROMPT_SUMMARY_LIMIT]
+
+
+def _questions_cache_key(article):
+    # Keyed on the prompt context too, so editing an article's title or summary
+    # invalidates its cached questions
+    title, summary = _prompt_context(article)
+    digest = hashlib.sha1(f"{title}\n{summary}".encode()).hexdigest()[:16]
+    return f"article_questions:{article.id}:{digest}"
+
+
+def _fallback_questions(article):
+    return [
+        f"What is the main idea of '{article.title}'?",
+        "What are the key takeaways from this article?",
+        "Can you explain the core concepts to a beginner?",
+    ]
+
 def summarize_articles(article):
     content = article.raw_content.strip()
     if len(content.split()) < 100:
         return False, f"Skipped (too short: {len(content.split())} words)"
 
+    model = _model()
+    if not model:
+        return False, "Gemini API not configured"
+
     prompt = SUMMARY_PROMPT_TEMPLATE + content
     try:
-        response = MODEL.generate_content(prompt)
+        response = model.generate_content(prompt)
         text = response.text.strip()
 
         # Parse response
@@ -45,7 +90,7 @@ def summarize_articles(article):
         article.summary = "\n".join(summary_lines[:3])
         article.prompts = [prompt_line or "Explore this concept further."]
         article.ai_generated = True
-        article.save()
+        article.save(update_fields=['summary', 'prompts', 'ai_generated'])
         return True, None
 
     except Exception as e:
@@ -55,48 +100,121 @@ def summarize_articles(article):
 def generate_questions_for_article(article: Article) -> list:
     """
     Generates a list of initial questions for an article using the Gemini API.
+    Successful results are cached, so repeat viewers don't trigger a new call.
     """
-    if not MODEL:
+    key = _questions_cache_key(article)
+    questions = cache.get(key)
+    if questions is not None:
+        return questions
+
+    model = _model()
+    if not model:
         raise Exception("Gemini API not configured")
 
+    title, summary = _prompt_context(article)
     prompt = f"""
     Based on the following article title and summary, generate three distinct, short, and engaging follow-up questions a curious reader might ask.
     Return the questions as a JSON list of strings. For example: ["Question 1?", "Question 2?", "Question 3?"].
 
-    Title: "{article.title}"
-    Summary: "{article.summary}"
+    Title: "{title}"
+    Summary: "{summary}"
 
     JSON List of Questions:
     """
     try:
-        response = MODEL.generate_content(prompt)
+        response = model.generate_content(prompt)
         # Basic cleaning to extract the JSON list
         cleaned_response = response.text.strip().replace("```json", "").replace("```", "").strip()
-        return json.loads(cleaned_response)
+        questions = json.loads(cleaned_response)
+        cache.set(key, questions, QUESTIONS_CACHE_TIMEOUT)
+        return questions
     except Exception as e:
         print(f"Error generating questions from Gemini: {e}")
         # Fallback questions
-        return [
-            f"What is the main idea of '{article.title}'?",
-            "What are the key takeaways from this article?",
-            "Can you explain the core concepts to a beginner?",
-        ]
+        return _fallback_questions(article)
+
+
+def generate_questions_bulk(articles: list) -> dict:
+    """
+    Generates initial questions for several articles with a single Gemini call.
+    Returns a mapping of article id -> list of questions. Results are cached per
+    article, so only articles without cached questions are sent to Gemini.
+    """
+    keys = {_questions_cache_key(article): article for article in articles}
+    cached = cache.get_many(keys.keys())
+    results = {keys[key].id: questions for key, questions in cached.items()}
+    missing = [article for key, article in keys.items() if key not in cached]
+    if not missing:
+        return results
+
+    model = _model()
+    if not model:
+        raise Exception("Gemini API not configured")
+
+    payload = []
+    for article in missing:
+        title, summary = _prompt_context(article)
+        payload.append({"id": article.id, "title": title, "summary": summary})
+
+    prompt = f"""
+    For each article below, generate three distinct, short, and engaging follow-up questions a curious reader might ask.
+    Return a JSON object mapping each article id (as a string) to its list of questions.
+    For example: {{"1": ["Question 1?", "Question 2?", "Question 3?"]}}.
+
+    Articles: {json.dumps(payload)}
+    """
+    try:
+        response = model.generate_content(
+            prompt,
+            generation_config={"response_mime_type": "application/json"},
+        )
+        generated = json.loads(response.text)
+    except Exception as e:
+        print(f"Error generating bulk questions from Gemini: {e}")
+        generated = {}
+
+    fresh = {}
+    for article in missing:
+        questions = generated.get(str(article.id))
+        if isinstance(questions, list) and questions:
+            fresh[_questions_cache_key(article)] = questions
+            results[article.id] = questions
+        else:
+            # Don't cache fallbacks so the next request retries Gemini
+            results[article.id] = _fallback_questions(article)
+    cache.set_many(fresh, QUESTIONS_CACHE_TIMEOUT)
+    return results
 
 
 def get_ai_response(article: Article, query: str) -> str:
     """
     Generates an answer to a user's query based on the article's content.
+    Gemini errors are turned into an apology for the user.
     """
-    if not MODEL:
+    try:
+        return generate_ai_answer(article, query)
+    except Exception as e:
+        print(f"Error getting answer from Gemini: {e}")
+        return "I'm sorry, I encountered an error while trying to answer your question. Please try again."
+
+
+def generate_ai_answer(article: Article, query: str) -> str:
+    """
+    Same as get_ai_response, but lets Gemini errors propagate, so background
+    jobs can record the failure.
+    """
+    model = _model()
+    if not model:
         raise Exception("Gemini API not configured")
 
+    title, summary = _prompt_context(article)
     prompt = f"""
     You are an AI assistant that explains technical topics in under 100 words based only on the provided article title and summary.
     Stay focused on the core idea of the article. Do not go beyond its scope. Use external resources or search only if it helps explain the core logic more clearly.
 
 
-    Article Title: "{article.title}"
-    Article Summary: "{article.summary}"
+    Article Title: "{title}"
+    Article Summary: "{summary}"
 
     ---
     User's Question: "{query}"
@@ -104,12 +222,8 @@ def get_ai_response(article: Article, query: str) -> str:
 
     Answer:
     """
-    try:
-        response = MODEL.generate_content(prompt)
-        return response.text.strip()
-    except Exception as e:
-        print(f"Error getting answer from Gemini: {e}")
-        return "I'm sorry, I encountered an error while trying to answer your question. Please try again."
+    response = model.generate_content(prompt)
+    return response.text.strip()
 
 
 from .models import ArticleStaging
@@ -139,7 +253,7 @@ def ingest_articles(tags=None):
                     "title": art["title"],
                     "source_name": art["source_name"],
                     "raw_content": art["raw_content"],
-                    "tag_suggestions": art["tag_suggestions"],
+                    "tag_suggestions": [t.strip()[:64] for t in art["tag_suggestions"] if t.strip()],
                     "published_at": published_at,
                 }
             )
@@ -1,25 +1,69 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import status, generics, viewsets
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.permissions import IsAuthenticated, AllowAny
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
 from django.conf import settings
-from .models import Article, FeedUpUser, Bookmark, AiResponseBookmark, Conference, ResearchUpdate # ✅ Import Article
-from .serializers import ArticleSerializer, BookmarkSerializer, FeedUpUserRegistrationSerializer, FeedUpUserLoginSerializer, AiResponseBookmarkSerializer, ConferenceSerializer, ResearchUpdateSerializer
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from .authentication import FeedUpJWTAuthentication
+from django.core.cache import cache
+from django.db import DataError, IntegrityError, transaction
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import Exists, F, OuterRef, Value
+from django.db.models.functions import Lower
+from .models import Article, FeedUpUser, Bookmark, AiResponseBookmark, AiJob, Conference, ResearchUpdate, OTPVerification
+from .serializers import ArticleListSerializer, FeedUpUserLoginSerializer, AiResponseBookmarkSerializer, ConferenceSerializer, ResearchUpdateSerializer
+from .authentication import FeedUpJWTAuthentication, OptionalFeedUpJWTAuthentication
 from django.contrib.auth.hashers import make_password, check_password
-from datetime import timedelta
+from datetime import date, timedelta
 from django.utils import timezone
 from uniapp.authentication import CustomJWTAuthentication
 from uniapp.permissions import IsStudent, IsFaculty, IsAdmin
-from .utils import generate_questions_for_article, get_ai_response
+from .utils import generate_questions_for_article, generate_questions_bulk, get_ai_response
+from .tasks import send_otp_email, answer_ai_job
+from uniBackend.background import enqueue
+import hashlib
 import logging
+import requests
+import time
 
 app_logger = logging.getLogger('feedup')
 
+# Shared HTTP session so fetching Google's signing certs reuses the TLS connection
+_GOOGLE_SESSION = requests.Session()
+_GOOGLE_TRANSPORT = google_requests.Request(session=_GOOGLE_SESSION)
+
+# Columns ArticleSerializer reads; list endpoints load nothing else
+ARTICLE_LIST_FIELDS = ('id', 'title', 'summary', 'source_url', 'source_name', 'published_at')
+
+
+def _verify_google_token(token):
+    """
+    Verifies a Google ID token, caching the claims until the token expires so
+    repeat logins with the same token skip the signature check.
+    """
+    key = 'gidt:' + hashlib.sha256(token.encode()).hexdigest()
+    idinfo = cache.get(key)
+    if idinfo is None:
+        idinfo = id_token.verify_oauth2_token(token, _GOOGLE_TRANSPORT, settings.GOOGLE_CLIENT_ID)
+        cache.set(key, idinfo, timeout=max(1, int(idinfo['exp']) - int(time.time())))
+    return idinfo
+
+
+def _register_token_claims(token):
+    """
+    Verifies a registration token from the OTP step and returns its email/scope
+    claims, cached until the token expires so retried submissions skip the decode.
+    """
+    key = 'jwt:' + hashlib.sha256(token.encode()).hexdigest()
+    claims = cache.get(key)
+    if claims is None:
+        decoded = AccessToken(token)
+        claims = {'email': decoded.get('email'), 'scope': decoded.get('scope'), 'exp': decoded['exp']}
+        cache.set(key, claims, timeout=max(1, int(claims['exp']) - int(time.time())))
+    return claims
+
 class CheckUserView(APIView):
     """Checks if a FeedUpUser exists with the given email."""
     permission_classes = [AllowAny]
@@ -29,7 +73,8 @@ class CheckUserView(APIView):
         if not email:
             return Response({"error": "Email is required"}, status=status.HTTP_400_BAD_REQUEST)
         
-        exists = FeedUpUser.objects.filter(email__iexact=email).exists()
+        # Matches feedupuser_email_lower_idx; email__iexact compiles to UPPER() and can't use it
+        exists = FeedUpUser.objects.annotate(email_lower=Lower('email')).filter(email_lower=email.lower()).exists()
         return Response({"exists": exists}, status=status.HTTP_200_OK)
 
 
@@ -73,7 +118,7 @@ class GoogleAuthView(APIView):
             return Response({"error": "ID token required"}, status=400)
 
         try:
-            idinfo = id_token.verify_oauth2_token(token, google_requests.Request(), settings.GOOGLE_CLIENT_ID)
+            idinfo = _verify_google_token(token)
 
             email = idinfo["email"]
             google_id = idinfo["sub"]
@@ -100,13 +145,34 @@ class GoogleAuthView(APIView):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-from rest_framework.pagination import PageNumberPagination
-class ArticleListPagination(PageNumberPagination):
+class ArticleListCursorPagination(CursorPagination):
+    # Keyset pagination over the (published_at, id) index; cost doesn't grow with scroll depth
+    page_size = 10
+    ordering = ('-published_at', '-id')
+
+class StandardResultsSetPagination(PageNumberPagination):
     page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+class DateCursorPagination(CursorPagination):
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class ConferenceCursorPagination(DateCursorPagination):
+    ordering = ('start_date', 'id')
+
+
+class ResearchUpdateCursorPagination(DateCursorPagination):
+    ordering = ('-publication_date', '-id')
 
 class ArticleListView(APIView):
+    # Public feed: only FeedUp users get bookmark flags; any other token reads anonymously
+    authentication_classes = [OptionalFeedUpJWTAuthentication]
     permission_classes = [AllowAny]
-    pagination_class = ArticleListPagination
+    pagination_class = ArticleListCursorPagination
 
     @property
     def paginator(self):
@@ -118,10 +184,17 @@ class ArticleListView(APIView):
         # ✅ FIX: Fetch directly from the final Article table.
         # This table ONLY contains processed articles, so the previous
         # filtering logic was incorrect and unnecessary.
-        queryset = Article.objects.all().order_by("-published_at")
+        # Ordering is applied by the cursor paginator
+        queryset = Article.objects.only(*ARTICLE_LIST_FIELDS)
+
+        # Resolve the bookmark flag for the whole page in the same query
+        if isinstance(request.user, FeedUpUser):
+            queryset = queryset.annotate(is_bookmarked=Exists(
+                Bookmark.objects.filter(user=request.user, article=OuterRef('pk'))
+            ))
 
         paginated_queryset = self.paginator.paginate_queryset(queryset, request, view=self)
-        serializer = ArticleSerializer(paginated_queryset, many=True)
+        serializer = ArticleListSerializer(paginated_queryset, many=True)
         return self.paginator.get_paginated_response(serializer.data)
 
 
@@ -133,47 +206,49 @@ class BookmarkView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user= request.user  
-        bookmarks = user.bookmarks.all()
-        articles = [bookmark.article for bookmark in bookmarks]
-        serializer = ArticleSerializer(articles, many=True)
-        return Response(serializer.data)
+        user = request.user
+        # Single JOIN through Bookmark, newest bookmark first
+        articles = (
+            Article.objects.filter(bookmarks__user=user)
+            .only(*ARTICLE_LIST_FIELDS)
+            .annotate(is_bookmarked=Value(True))
+            .order_by('-bookmarks__created_at')
+        )
+        paginator = StandardResultsSetPagination()
+        page = paginator.paginate_queryset(articles, request, view=self)
+        serializer = ArticleListSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         article_id = request.data.get('article_id')
         if not article_id:
             return Response({"error": "article_id is required"}, status=status.HTTP_400_BAD_REQUEST)
-           
+
+        # Repeat taps find the existing row (unique_together), so they answer 200
+        # rather than 201. The atomic block surfaces the deferred FK check, so a
+        # missing article fails here instead of at some later commit
         try:
-            # ✅ Query the final Article table directly.
-            article = Article.objects.get(id=article_id)
-        except Article.DoesNotExist:
+            with transaction.atomic():
+                _, created = Bookmark.objects.get_or_create(user=request.user, article_id=article_id)
+        except (IntegrityError, ValueError, DataError):
             return Response({"error": "Article not found"}, status=status.HTTP_404_NOT_FOUND)
-           
-    
-        user = request.user  
-           
-        bookmark, created = Bookmark.objects.get_or_create(user=user, article=article)
-       
-        if created:
-            return Response({"status": "bookmarked"}, status=status.HTTP_201_CREATED)
-        else:
-            bookmark.delete()
-            return Response({"status": "unbookmarked"}, status=status.HTTP_200_OK)
 
+        return Response(
+            {"status": "bookmarked"},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
 
-        
-class FeedUpRegisterView(APIView):
-    permission_classes = [AllowAny]
+    def delete(self, request):
+        article_id = request.data.get('article_id') or request.query_params.get('article_id')
+        if not article_id:
+            return Response({"error": "article_id is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-    def post(self, request):
-        serializer = FeedUpUserRegistrationSerializer(data=request.data)
-        if serializer.is_valid():
-            user = serializer.save()
-            # Here you would typically send an OTP for email verification
-            # For now, we'll just return success.
-            return Response({"message": "User registered successfully. Please verify your email."}, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            Bookmark.objects.filter(user=request.user, article_id=article_id).delete()
+        except (ValueError, DataError):
+            return Response({"error": "Article not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({"status": "unbookmarked"}, status=status.HTTP_200_OK)
 
 
 class FeedUpLoginView(APIView):
@@ -187,12 +262,8 @@ class FeedUpLoginView(APIView):
         email = serializer.validated_data['email']
         password = serializer.validated_data['password']
 
-        try:
-            user = FeedUpUser.objects.get(email=email)
-        except FeedUpUser.DoesNotExist:
-            return Response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
-
-        if not user.password or not check_password(password, user.password):
+        user = FeedUpUser.objects.filter(email=email).only('id', 'email', 'password').first()
+        if user is None or not user.password or not check_password(password, user.password):
             return Response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
 
         # If credentials are valid, generate tokens
@@ -206,17 +277,6 @@ class FeedUpLoginView(APIView):
             'access': str(refresh.access_token),
         })
 
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework import status
-from rest_framework.permissions import AllowAny
-from django.utils import timezone
-from django.contrib.auth.hashers import make_password, check_password
-from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
-
-from .models import FeedUpUser, OTPVerification
-from .serializers import FeedUpUserLoginSerializer # We will use this later
-
 
 class FeedUpSendOtpView(APIView):
     permission_classes = [AllowAny]
@@ -226,13 +286,17 @@ class FeedUpSendOtpView(APIView):
         if not email:
             return Response({"error": "Email is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        OTPVerification.objects.filter(email=email).delete() # Invalidate old OTPs
         otp_code = OTPVerification.generate_otp()
-        OTPVerification.objects.create(email=email, otp=otp_code)
+        # Replaces any previous OTP for this email in place, which also invalidates it
+        OTPVerification.objects.update_or_create(
+            email=email,
+            defaults={'otp': otp_code, 'expires_at': timezone.now() + timedelta(minutes=10)},
+        )
 
-        # In a real app, you would use a service like SendGrid to email the OTP.
-        # For development, we print it to the console.
-        print(f"✅ OTP for {email}: {otp_code}")
+        # Mail is sent off the request thread; in development the OTP is also printed.
+        enqueue(send_otp_email, email, otp_code)
+        if settings.DEBUG:
+            print(f"✅ OTP for {email}: {otp_code}")
 
         return Response({"message": "OTP sent successfully."}, status=status.HTTP_200_OK)
 
@@ -286,20 +350,19 @@ class FeedUpRegisterView(APIView):
             return Response({"error": "Email, password, and token are required"}, status=status.HTTP_400_BAD_REQUEST)
 
         try: # Validate the temporary token from the OTP step
-            decoded_token = AccessToken(token)
-            if decoded_token['scope'] != 'register' or decoded_token['email'] != email:
+            claims = _register_token_claims(token)
+            if claims['scope'] != 'register' or claims['email'] != email:
                 raise Exception()
         except Exception:
             return Response({"error": "Invalid or expired verification token"}, status=status.HTTP_401_UNAUTHORIZED)
 
-        if FeedUpUser.objects.filter(email=email).exists():
-            return Response({"error": "User with this email already exists."}, status=status.HTTP_400_BAD_REQUEST)
-
-        user = FeedUpUser.objects.create(
+        # Single race-free INSERT; the unique email constraint settles concurrent registrations
+        user, created = FeedUpUser.objects.get_or_create(
             email=email,
-            name=email.split('@')[0],
-            password=make_password(password)
+            defaults={'name': email.split('@')[0], 'password': make_password(password)},
         )
+        if not created:
+            return Response({"error": "User with this email already exists."}, status=status.HTTP_400_BAD_REQUEST)
 
         # Generate JWT tokens to log the new user in
         refresh = RefreshToken()
@@ -336,13 +399,22 @@ class AskAiView(APIView):
     Handles AI-related queries for articles.
     - POST without a 'query' generates initial questions.
     - POST with a 'query' gets a specific answer.
+    - POST with 'article_ids' (a list) generates initial questions for a whole
+      page of articles in one Gemini call.
+    - POST with a 'query' and 'async': true queues the answer and returns 202
+      with a job_id to poll at ask-ai/jobs/<job_id>/.
     """
     authentication_classes = [FeedUpJWTAuthentication]
     permission_classes = [IsAuthenticated]
+    max_bulk_articles = 50
 
     def post(self, request, *args, **kwargs):
         article_id = request.data.get('article_id')
         query = request.data.get('query')
+        article_ids = request.data.get('article_ids')
+
+        if article_ids is not None and not query:
+            return self.bulk_questions(request, article_ids)
 
         if not article_id:
             return Response({"error": "article_id is required"}, status=status.HTTP_400_BAD_REQUEST)
@@ -352,26 +424,73 @@ class AskAiView(APIView):
         except Article.DoesNotExist:
             return Response({"error": "Article not found"}, status=status.HTTP_404_NOT_FOUND)
 
+        if query and request.data.get('async'):
+            # Action: Answer a user's query in the background
+            job = AiJob.objects.create(user=request.user, article=article, query=query)
+            transaction.on_commit(lambda: enqueue(answer_ai_job, job.id))
+            return Response({"job_id": str(job.id), "status": job.status}, status=status.HTTP_202_ACCEPTED)
+
         if query:
             # Action: Answer a user's query
             try:
                 answer = get_ai_response(article, query)
-                app_logger.info(f"User {request.user.email} asked '{query}' for article {article_id}")
+                app_logger.info("User %s asked %r for article %s", request.user.email, query, article_id)
                 return Response({"answer": answer}, status=status.HTTP_200_OK)
             except Exception as e:
-                app_logger.error(f"Error getting AI response for article {article_id}: {e}")
+                app_logger.error("Error getting AI response for article %s: %s", article_id, e)
                 return Response({"error": "Failed to get AI response"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         else:
             # Action: Generate initial questions
             try:
                 questions = generate_questions_for_article(article)
-                app_logger.info(f"Generated questions for article {article_id} for user {request.user.email}")
+                app_logger.info("Generated questions for article %s for user %s", article_id, request.user.email)
                 return Response({"questions": questions}, status=status.HTTP_200_OK)
             except Exception as e:
-                app_logger.error(f"Error generating questions for article {article_id}: {e}")
+                app_logger.error("Error generating questions for article %s: %s", article_id, e)
                 return Response({"error": "Failed to generate questions"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-from rest_framework import generics
+    def bulk_questions(self, request, article_ids):
+        if not isinstance(article_ids, list) or not article_ids:
+            return Response({"error": "article_ids must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(article_ids) > self.max_bulk_articles:
+            return Response(
+                {"error": f"At most {self.max_bulk_articles} article_ids are allowed per request"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        articles = list(Article.objects.filter(id__in=article_ids).only('id', 'title', 'summary'))
+        try:
+            questions = generate_questions_bulk(articles)
+            app_logger.info("Generated questions for %d articles for user %s", len(articles), request.user.email)
+            return Response({"questions": {str(k): v for k, v in questions.items()}}, status=status.HTTP_200_OK)
+        except Exception as e:
+            app_logger.error("Error generating bulk questions for articles %s: %s", article_ids, e)
+            return Response({"error": "Failed to generate questions"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class AiJobStatusView(APIView):
+    """
+    Returns the status of a background Ask AI job, with the answer once done.
+    """
+    authentication_classes = [FeedUpJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id, *args, **kwargs):
+        job = AiJob.objects.filter(id=job_id, user=request.user).only('id', 'status', 'answer', 'created_at').first()
+        if job is None:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        if job.status == AiJob.STATUS_PENDING and job.created_at < timezone.now() - AiJob.STALE_AFTER:
+            # Lost to a restart; fail it so the client stops polling. Conditional,
+            # so a job that has just finished keeps its answer
+            if AiJob.objects.filter(pk=job.pk, status=AiJob.STATUS_PENDING).update(status=AiJob.STATUS_FAILED):
+                job.status = AiJob.STATUS_FAILED
+
+        data = {"job_id": str(job.id), "status": job.status}
+        if job.status == AiJob.STATUS_DONE:
+            data["answer"] = job.answer
+        elif job.status == AiJob.STATUS_FAILED:
+            data["error"] = "Failed to get AI response"
+        return Response(data, status=status.HTTP_200_OK)
 
 class AiResponseBookmarkListView(generics.ListAPIView):
     """
@@ -382,7 +501,15 @@ class AiResponseBookmarkListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return AiResponseBookmark.objects.filter(user=self.request.user)
+        # original_article is nested in the serializer, so JOIN it up front
+        return (
+            AiResponseBookmark.objects.filter(user=self.request.user)
+            .select_related('original_article')
+            .only(
+                'id', 'question', 'answer', 'created_at', 'original_article',
+                *(f'original_article__{field}' for field in ARTICLE_LIST_FIELDS),
+            )
+        )
 
 
 class AiResponseBookmarkToggleView(APIView):
@@ -425,29 +552,23 @@ class AiResponseBookmarkToggleView(APIView):
             bookmark.delete()
             return Response({"status": "bookmark_removed"}, status=status.HTTP_204_NO_CONTENT)
 
-from rest_framework.pagination import PageNumberPagination
-from .models import Conference, ResearchUpdate
-from .serializers import ConferenceSerializer, ResearchUpdateSerializer
-from django.utils import timezone
-from rest_framework.filters import SearchFilter, OrderingFilter
-from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets, mixins
-from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
-from datetime import date
-
-class StandardResultsSetPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
-
 
 class ConferenceViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Conference.objects.all()  # Add this line
     serializer_class = ConferenceSerializer
     authentication_classes = [FeedUpJWTAuthentication]
     permission_classes = [IsAuthenticated]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = ConferenceCursorPagination
+
+    @property
+    def paginator(self):
+        # Search results are ordered by relevance, which a cursor can't page over
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get('search', '').strip():
+                self._paginator = StandardResultsSetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
 
     def get_queryset(self):
         queryset = Conference.objects.all()
@@ -463,32 +584,33 @@ class ConferenceViewSet(viewsets.ReadOnlyModelViewSet):
         if not show_past:
             queryset = queryset.filter(start_date__gte=today)
         
-        # Search filter (title, description, location)
+        # Full-text search over title, description, location and topics (GIN-indexed),
+        # best matches first; title hits outrank description, location and topic hits
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(description__icontains=search) |
-                Q(location__icontains=search) |
-                Q(topics__icontains=search)
+            query = SearchQuery(search, config='english', search_type='websearch')
+            queryset = (
+                queryset.filter(search_vector=query)
+                .annotate(rank=SearchRank(F('search_vector'), query))
+                .order_by('-rank', 'start_date', 'id')
             )
         
-        # Location filter
+        # Location filter (trigram-indexed)
         if location:
             queryset = queryset.filter(location__icontains=location)
         
-        # Topic filter
+        # Topic filter (trigram-indexed)
         if topic:
             queryset = queryset.filter(topics__icontains=topic)
         
-        # Order by start date
-        return queryset.order_by('start_date')
+        # Without a search, ordering (start date, then id) is applied by the cursor paginator
+        return queryset
 
 class ResearchUpdateViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = ResearchUpdate.objects.all()  # Add this line
     serializer_class = ResearchUpdateSerializer
     authentication_classes = [FeedUpJWTAuthentication]
     permission_classes = [IsAuthenticated]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = ResearchUpdateCursorPagination
 
     def get_queryset(self):
         queryset = ResearchUpdate.objects.all()
@@ -499,13 +621,9 @@ class ResearchUpdateViewSet(viewsets.ReadOnlyModelViewSet):
         institution = self.request.query_params.get('institution', '').strip()
         recent_days = self.request.query_params.get('recent_days')
         
-        # Search filter (title, summary, authors)
+        # Full-text search over title, summary and authors (GIN-indexed)
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(summary__icontains=search) |
-                Q(authors__icontains=search)
-            )
+            queryset = queryset.filter(search_vector=SearchQuery(search, config='english', search_type='websearch'))
         
         # Category filter
         if category:
@@ -524,5 +642,5 @@ class ResearchUpdateViewSet(viewsets.ReadOnlyModelViewSet):
             except ValueError:
                 pass
         
-        # Order by publication date (newest first)
-        return queryset.order_by('-publication_date')
+        # Ordering (newest publication date first) is applied by the cursor paginator
+        return queryset
@@ -0,0 +1,29 @@
+"""
+In-process background pool shared by uniapp and feedup.
+
+There is no task queue in this deployment, so slow side effects (sending mail,
+Gemini calls) run on one small thread pool instead of holding up the request
+thread. The tasks themselves live in each app's tasks module.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='bg-task')
+
+
+def _run(func, *args):
+    try:
+        func(*args)
+    except Exception:
+        # Logged under the task's own module, so that module's logging config applies
+        logging.getLogger(func.__module__).exception("Background task %s failed", func.__name__)
+    finally:
+        # Worker threads hold their own DB connections; don't leak them
+        close_old_connections()
+
+
+def enqueue(func, *args):
+    """Runs func(*args) on the background pool and returns immediately."""
+    return _executor.submit(_run, func, *args)
@@ -0,0 +1,45 @@
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+class _LazyQueueHandler(QueueHandler):
+    """QueueHandler that starts its listener thread on the first record it queues."""
+
+    def __init__(self, records, listener):
+        super().__init__(records)
+        self.listener = listener
+        self._start_lock = threading.Lock()
+        self._started = False
+
+    def enqueue(self, record):
+        if not self._started:
+            with self._start_lock:
+                if not self._started:
+                    self.listener.start()
+                    # Flush whatever is still queued when the process exits
+                    atexit.register(self.listener.stop)
+                    self._started = True
+        super().enqueue(record)
+
+
+def queued_handler(filename, level=logging.INFO):
+    """
+    Returns a QueueHandler whose records are written to `filename` and the console
+    by a background QueueListener, so logging calls never block on I/O.
+
+    Neither the listener thread nor the file exists until something is logged, so
+    processes that never log to it (web workers, unrelated commands) pay nothing.
+
+    Used as a '()' factory in settings.LOGGING; dictConfig on Python < 3.12 can't
+    declare a listener itself.
+    """
+    handlers = [logging.FileHandler(filename, delay=True), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setLevel(level)
+
+    records = queue.SimpleQueue()
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    return _LazyQueueHandler(records, listener)
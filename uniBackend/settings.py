@@ -54,6 +54,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'uniapp',
     'rest_framework',
     'rest_framework.authtoken',
@@ -153,9 +154,22 @@ DATABASES = {
         'PASSWORD': env('DB_PASSWORD'),
         'HOST': env('DB_HOST', default='localhost'),
         'PORT': env('DB_PORT', default='5432'),
+        # Keep connections open between requests instead of reconnecting every time
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=60),
+        'CONN_HEALTH_CHECKS': True,
+        # Set when running behind PgBouncer in transaction pooling mode
+        'DISABLE_SERVER_SIDE_CURSORS': env.bool('DB_DISABLE_SERVER_SIDE_CURSORS', default=False),
     }
 }
 
+# Shared by every gunicorn worker, so a signal's cache.delete() reaches them all
+# (the default LocMemCache is per-process). Defaults to a table in the main
+# database, created by `manage.py createcachetable`; set CACHE_URL
+# (e.g. redis://host:6379/0) to use another backend.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='dbcache://django_cache'),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -241,19 +255,22 @@ LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
     'handlers': {
-        'file': {
-            'level': 'INFO',
-            'class': 'logging.FileHandler',
+        # File + console output, written by a background thread off the request path
+        'queue': {
+            '()': 'uniBackend.log_handlers.queued_handler',
             'filename': 'feedup_ingestion.log',
         },
-        'console': {
-            'level': 'INFO',
-            'class': 'logging.StreamHandler',
-        },
     },
+    # Only ingestion (the fetchers and the commands that run them) goes to the
+    # file; every other logger keeps propagating to the root/console handlers
     'loggers': {
         'feedup.ingestion': {
-            'handlers': ['file', 'console'],
+            'handlers': ['queue'],
+            'level': 'INFO',
+            'propagate': True,
+        },
+        'feedup.management': {
+            'handlers': ['queue'],
             'level': 'INFO',
             'propagate': True,
         },
@@ -25,25 +25,14 @@ def home_redirect(request):
     return redirect('/admin/')
 
 urlpatterns = [
-    # The path should be 'feedup/', not 'api/feedup/'
-    path('feedup/', include('feedup.urls')), 
-
-    # Auth
-    path("views/token/refresh/", CustomTokenRefreshView.as_view(), name="token_refresh"),
-    path("token/logout/", TokenBlacklistView.as_view(), name="token_blacklist"),
-
-    # Admin
-    path("admin/", admin.site.urls),
-    path('admin/', include('nested_admin.urls')),
-
-    # OTP
-    path("views/request-otp/", RequestOTPView.as_view(), name="request-otp"),
-    path("views/verify-otp/", VerifyOTPView.as_view(), name="verify-otp"),
-
+    # Most-requested routes first; the resolver tries patterns in order
     # Student
     path('views/student/posts/', StudentPostListView.as_view(), name='student-posts'),
     path('views/student/posts/save/', ToggleSavePostView.as_view(), name='save-post'),
 
+    # The path should be 'feedup/', not 'api/feedup/'
+    path('feedup/', include('feedup.urls')), 
+
     # Faculty
     path('views/faculty/posts/', FacultyPostListView.as_view(), name='faculty-post-list'),
     path('views/faculty/posts/create/', FacultyPostCreateView.as_view(), name='faculty-post-create'),
@@ -53,4 +42,17 @@ urlpatterns = [
     path('views/faculty/majors/', FacultyMajorsAPIView.as_view(), name='faculty-majors'),
     # Department
     path('views/departments/', DepartmentListView.as_view(), name='department-list'),
-]
\ No newline at end of file
+
+    # Auth
+    path("views/token/refresh/", CustomTokenRefreshView.as_view(), name="token_refresh"),
+    path("token/logout/", TokenBlacklistView.as_view(), name="token_blacklist"),
+
+    # OTP
+    path("views/request-otp/", RequestOTPView.as_view(), name="request-otp"),
+    path("views/verify-otp/", VerifyOTPView.as_view(), name="verify-otp"),
+
+    # Admin
+    # nested_admin's server-data.js needs its own prefix; under admin/ it was shadowed by the admin catch-all
+    path('_nested_admin/', include('nested_admin.urls')),
+    path("admin/", admin.site.urls),
+]
@@ -1,26 +1,114 @@
 import nested_admin
 from django.contrib import admin
 from django.utils.html import format_html
-from django.urls import reverse
+from functools import lru_cache
+from django.urls import reverse, get_script_prefix
 from django.http import HttpResponseRedirect
 from django.contrib import messages
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils.functional import cached_property
 from .models import (
     Department, Course, Semester, Subject,
     Student, Faculty, Admin as AdminUser,
     OTPVerification, Post, SavedPost, ResearchMajor
 )
 
-# === Nested Inlines ===
+_PK_PLACEHOLDER = "__pk__"
 
-class SubjectInline(nested_admin.NestedTabularInline):
-    model = Subject
-    extra = 1
+
+@lru_cache(maxsize=32)
+def _admin_url_template(name, script_prefix, with_pk):
+    return reverse(name, args=[_PK_PLACEHOLDER] if with_pk else None)
+
+
+def admin_url(name, pk=None):
+    """reverse() for changelist rows: resolve each URL name once, then fill in the pk."""
+    url = _admin_url_template(name, get_script_prefix(), pk is not None)
+    return url if pk is None else url.replace(_PK_PLACEHOLDER, str(pk))
+
+
+# ResearchMajorAdmin.action_buttons: edit link, then a delete link that may be disabled
+_ACTION_BUTTONS_TEMPLATE = (
+    '<a class="button" href="{}">Edit</a> '
+    '<a class="{}" href="{}" onclick="{}">Delete</a>'
+)
+
+# === Pagination ===
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Changelist paginator for large tables: an unfiltered changelist uses the
+    planner's row estimate instead of a full-table COUNT(*).
+    """
+    exact_count_threshold = 10000
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if not query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [query.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > self.exact_count_threshold:
+                return row[0]
+        return super().count
+
+
+class ColumnsChangeList(ChangeList):
+    """Changelist whose rendered page only SELECTs the admin's `list_only` columns."""
+
+    def get_results(self, request):
+        # Narrow only the page being rendered; actions get a fresh get_queryset()
+        if self.model_admin.list_only:
+            self.queryset = self.queryset.only(*self.model_admin.list_only)
+        super().get_results(request)
+
+
+class ListOnlyMixin:
+    """
+    Restricts the rendered changelist rows to `list_only`, the columns that
+    list_display and the related objects' __str__ actually read. Actions
+    receive the changelist's get_queryset(), which is not narrowed, so they
+    work on full rows (deleting a Post reads its attachment URLs); change
+    forms load full rows too.
+    """
+    list_only = ()
+
+    def get_changelist(self, request, **kwargs):
+        return ColumnsChangeList
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Admin defaults for high-volume tables; subclasses set an indexed `ordering`."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+# === Nested Inlines ===
 
 class SemesterInline(nested_admin.NestedTabularInline):
     model = Semester
-    inlines = [SubjectInline]
+    # Subjects are edited on their own changelist; nesting them rendered the
+    # whole department subtree on one page
+    fields = ("name", "subjects_link")
+    readonly_fields = ("subjects_link",)
     extra = 1
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_subject_count=Count('subjects'))
+
+    def subjects_link(self, obj):
+        if not obj.pk:
+            return "-"
+        url = admin_url('admin:uniapp_subject_changelist')
+        return format_html('<a href="{}?semester__id__exact={}">Subjects ({})</a>', url, obj.pk, obj._subject_count)
+    subjects_link.short_description = "Subjects"
+
 class CourseInline(nested_admin.NestedTabularInline):
     model = Course
     inlines = [SemesterInline]
@@ -34,9 +122,19 @@ class DepartmentAdmin(nested_admin.NestedModelAdmin):
 
 # === Regular Admins ===
 
+@admin.register(Subject)
+class SubjectAdmin(admin.ModelAdmin):
+    list_display = ("name", "semester", "faculty")
+    list_select_related = ("semester__course", "faculty")
+    search_fields = ("name",)
+    autocomplete_fields = ("faculty",)
+    raw_id_fields = ("semester",)
+
 @admin.register(Student)
-class StudentAdmin(admin.ModelAdmin):
+class StudentAdmin(ListOnlyMixin, admin.ModelAdmin):
     list_display = ("enrollment_number", "email", "course", "department")
+    list_select_related = ("course__department",)
+    list_only = ("id", "enrollment_number", "email", "course__name", "course__department__name")
     search_fields = ("enrollment_number", "email")
 
 @admin.register(Faculty)
@@ -45,6 +143,10 @@ class FacultyAdmin(admin.ModelAdmin):
     list_filter = ['department', 'majors']
     search_fields = ['name', 'email']
     filter_horizontal = ['courses', 'majors']  # Nice UI for many-to-many
+
+    def get_queryset(self, request):
+        # get_majors reads obj.majors.all() for every row
+        return super().get_queryset(request).select_related('department').prefetch_related('majors')
     
     def get_majors(self, obj):
         """Display faculty's research majors"""
@@ -57,22 +159,43 @@ class FacultyAdmin(admin.ModelAdmin):
 @admin.register(AdminUser)
 class AdminAdmin(admin.ModelAdmin):
     list_display = ("email", "department")
+    list_select_related = ("department",)
     search_fields = ("email",)
 
 @admin.register(OTPVerification)
-class OTPVerificationAdmin(admin.ModelAdmin):
+class OTPVerificationAdmin(LargeTableAdmin):
     list_display = ("email", "otp", "created_at")
+    ordering = ("-created_at",)
     search_fields = ("email",)
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(ListOnlyMixin, LargeTableAdmin):
     list_display = ("faculty", "course", "semester", "subject", "created_at")
+    # Semester/Subject __str__ read their course, so follow those FKs too
+    list_select_related = ("faculty", "course", "semester__course", "subject__semester__course")
+    list_only = (
+        "id", "created_at", "faculty__email", "course__name",
+        "semester__name", "semester__course__name",
+        "subject__name", "subject__semester__name", "subject__semester__course__name",
+    )
+    # Looked up on demand instead of rendering every row as a <select> option;
+    # course/semester/subject have no standalone admin to autocomplete against
+    autocomplete_fields = ("faculty", "department")
+    raw_id_fields = ("course", "semester", "subject")
+    ordering = ("-created_at",)
     search_fields = ("content",)
     list_filter = ("department", "course", "semester")
 
 @admin.register(SavedPost)
-class SavedPostAdmin(admin.ModelAdmin):
+class SavedPostAdmin(ListOnlyMixin, LargeTableAdmin):
     list_display = ("student", "post", "saved_at")
+    list_select_related = ("student", "post")
+    list_only = (
+        "id", "saved_at", "student__enrollment_number", "student__email",
+        "post__course", "post__semester",
+    )
+    autocomplete_fields = ("student", "post")
+    ordering = ("-saved_at",)
     search_fields = ("student__email", "post__content")
     list_filter = ("student",)
 
@@ -84,8 +207,13 @@ class ResearchMajorAdmin(admin.ModelAdmin):
     ordering = ['category', 'name']
     
     # Enable bulk actions and default delete
-    actions = ['delete_selected_majors', 'duplicate_selected_majors', 'delete_selected']
+    actions = ['delete_selected_majors', 'delete_selected']
     
+    def get_queryset(self, request):
+        # One COUNT per page instead of one per row in faculty_count/action_buttons;
+        # change views and admin actions get the annotation too
+        return super().get_queryset(request).annotate(_faculty_count=Count('faculty_members'))
+
     # IMPORTANT: Allow deletion
     def has_delete_permission(self, request, obj=None):
         return True
@@ -95,11 +223,10 @@ class ResearchMajorAdmin(admin.ModelAdmin):
     
     def action_buttons(self, obj):
         """Custom action buttons for each research major"""
-        edit_url = reverse('admin:uniapp_researchmajor_change', args=[obj.id])
-        delete_url = reverse('admin:uniapp_researchmajor_delete', args=[obj.id])
+        edit_url = admin_url('admin:uniapp_researchmajor_change', obj.id)
+        delete_url = admin_url('admin:uniapp_researchmajor_delete', obj.id)
 
-        faculty_count = obj.faculty_members.count()
-        delete_disabled = faculty_count > 0
+        delete_disabled = obj._faculty_count > 0
 
         if delete_disabled:
             onclick = "alert('Cannot delete: assigned to faculty'); return false;"
@@ -110,19 +237,12 @@ class ResearchMajorAdmin(admin.ModelAdmin):
             href = delete_url
             button_class = "button"
 
-        delete_button = (
-            f'<a class="{button_class}" href="{href}" onclick="{onclick}">Delete</a>'
-        )
-
-        return format_html(
-            '<a class="button" href="{}">Edit</a> {}',
-            edit_url, delete_button
-        )
+        return format_html(_ACTION_BUTTONS_TEMPLATE, edit_url, button_class, href, onclick)
     action_buttons.short_description = "Actions"
     
     def delete_model(self, request, obj):
         """Override delete to check for faculty assignments"""
-        faculty_count = obj.faculty_members.count()
+        faculty_count = obj._faculty_count
         
         if faculty_count > 0:
             self.message_user(
@@ -144,20 +264,21 @@ class ResearchMajorAdmin(admin.ModelAdmin):
     
     def faculty_count(self, obj):
         """Show how many faculty members have this major"""
-        count = obj.faculty_members.count()
+        count = obj._faculty_count
         if count > 0:
-            url = reverse('admin:uniapp_faculty_changelist') + f'?majors__id__exact={obj.id}'
+            url = admin_url('admin:uniapp_faculty_changelist') + f'?majors__id__exact={obj.id}'
             return format_html('<a href="{}">{} faculty</a>', url, count)
         return '0 faculty'
     faculty_count.short_description = "Faculty Members"
     
     def delete_selected_majors(self, request, queryset):
         """Custom bulk delete action with confirmation"""
+        majors = list(queryset)
         faculty_with_majors = []
         
         # Check if any selected majors are assigned to faculty
-        for major in queryset:
-            faculty_count = major.faculty_members.count()
+        for major in majors:
+            faculty_count = major._faculty_count
             if faculty_count > 0:
                 faculty_with_majors.append(f"{major.name} ({faculty_count} faculty)")
         
@@ -170,9 +291,11 @@ class ResearchMajorAdmin(admin.ModelAdmin):
             )
             return HttpResponseRedirect(request.get_full_path())
         
-        # Safe to delete
-        count = queryset.count()
-        queryset.delete()
+        # Safe to delete; by pk so the grouped faculty-count query isn't rerun.
+        # The collector (not _raw_delete) still clears any faculty_members rows
+        with transaction.atomic():
+            ResearchMajor.objects.filter(pk__in=[major.pk for major in majors]).delete()
+        count = len(majors)
         self.message_user(
             request,
             f"Successfully deleted {count} research major(s).",
@@ -181,60 +304,27 @@ class ResearchMajorAdmin(admin.ModelAdmin):
     
     delete_selected_majors.short_description = "Delete selected research majors (with safety check)"
     
-    def duplicate_selected_majors(self, request, queryset):
-        """Duplicate selected research majors"""
-        duplicated = 0
-        
-        for major in queryset:
-            # Create a copy with modified name
-            try:
-                new_major = ResearchMajor.objects.create(
-                    name=f"{major.name} (Copy)",
-                    category=major.category,
-                    description=f"Copy of: {major.description}" if major.description else "Copy"
-                )
-                duplicated += 1
-            except Exception as e:
-                self.message_user(
-                    request,
-                    f"Error duplicating {major.name}: {str(e)}",
-                    level=messages.ERROR
-                )
-        
-        if duplicated > 0:
-            self.message_user(
-                request,
-                f"Successfully duplicated {duplicated} research major(s).",
-                level=messages.SUCCESS
-            )
-    
-    duplicate_selected_majors.short_description = "Duplicate selected research majors"
-    
     def get_readonly_fields(self, request, obj=None):
         """Make certain fields readonly based on conditions"""
         readonly_fields = []
         
         # If major is assigned to faculty, make category readonly to prevent breaking assignments
-        if obj and obj.faculty_members.exists():
+        if obj and obj._faculty_count > 0:
             readonly_fields.append('category')
             
         return readonly_fields
     
     def save_model(self, request, obj, form, change):
         """Override save to add custom logic"""
-        if change:
-            # Editing existing major
-            try:
-                old_obj = ResearchMajor.objects.get(pk=obj.pk)
-                if old_obj.category != obj.category and obj.faculty_members.exists():
-                    self.message_user(
-                        request,
-                        f"Warning: Changing category for '{obj.name}' may affect research paper filtering "
-                        f"for {obj.faculty_members.count()} faculty member(s).",
-                        level=messages.WARNING
-                    )
-            except ResearchMajor.DoesNotExist:
-                pass
+        # The form already knows whether category changed, and the change view's
+        # object carries the _faculty_count annotation, so no lookups are needed
+        if change and 'category' in form.changed_data and obj._faculty_count > 0:
+            self.message_user(
+                request,
+                f"Warning: Changing category for '{obj.name}' may affect research paper filtering "
+                f"for {obj._faculty_count} faculty member(s).",
+                level=messages.WARNING
+            )
         
         super().save_model(request, obj, form, change)
         
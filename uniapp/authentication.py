@@ -1,11 +1,30 @@
+import sys
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from .models import Student, Faculty, Admin
 
+# Profile model for each user_type claim
+USER_MODELS = {
+    "student": Student,
+    "faculty": Faculty,
+    "admin": Admin,
+}
+
+# FKs views read off request.user.profile, joined up front;
+# a student's department comes through its course
+AUTH_USER_SELECT_RELATED = {
+    "student": ("course__department", "semester"),
+    "faculty": ("department",),
+    "admin": ("department",),
+}
+
+
 class CustomUserWrapper:
     def __init__(self, user_obj, user_type):
         self.profile = user_obj
-        self.user_type = user_type
+        # Interned so role checks against the "student"/"faculty"/"admin" literals
+        # hit CPython's identity fast path; the claim is a fresh str per token decode
+        self.user_type = sys.intern(user_type)
         self.email = user_obj.email
         self.is_authenticated = True  # this makes DRF happy
 
@@ -17,11 +36,7 @@ class CustomJWTAuthentication(JWTAuthentication):
         if not email or not user_type:
             raise AuthenticationFailed("Invalid token payload.")
 
-        model = {
-            "student": Student,
-            "faculty": Faculty,
-            "admin": Admin
-        }.get(user_type)
+        model = USER_MODELS.get(user_type)
 
         if not model:
             # raise AuthenticationFailed("Invalid user type.")
@@ -29,11 +44,13 @@ class CustomJWTAuthentication(JWTAuthentication):
             # ✅ FIX: If the user_type is not one this authenticator handles,
             # fail gracefully by returning None. This allows other authenticators
             # in the chain i.e. bookmarkview's  authentication_classes = [CustomJWTAuthentication, FeedUpJWTAuthentication] to attempt to validate the token.
+        # Looked up on every request, not cached: a deleted profile must stop
+        # authenticating at once, on every worker
         try:
-            user_obj = model.objects.get(email=email)
-            return CustomUserWrapper(user_obj, user_type)
+            user_obj = model.objects.select_related(*AUTH_USER_SELECT_RELATED[user_type]).get(email=email)
         except model.DoesNotExist:
             raise AuthenticationFailed("User not found.")
+        return CustomUserWrapper(user_obj, user_type)
 
 
 
@@ -0,0 +1,10 @@
+# Run periodically (e.g. cron: */15 * * * * python manage.py purge_expired_otps)
+from django.core.management.base import BaseCommand
+from uniapp.models import OTPVerification
+
+class Command(BaseCommand):
+    help = 'Delete expired OTP verification rows'
+
+    def handle(self, *args, **options):
+        deleted = OTPVerification.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} expired OTPs"))
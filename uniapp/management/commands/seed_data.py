@@ -1,4 +1,6 @@
+from collections import defaultdict
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from uniapp.models import Department, Course, Semester, Faculty, Student, Admin  # Adjust `app` to your app name
 from random import randint
 
@@ -16,82 +18,89 @@ class Command(BaseCommand):
 
         print("🌱 Seeding database...")
 
-        # 1. Create Departments
-        dept_names = ["Computer Science", "Zoology", "Physics"]
-        departments = []
-        for name in dept_names:
-            dept = Department.objects.create(name=name)
-            departments.append(dept)
-
-        # 2. Create Courses under each Department
-        course_config = {
-            "Computer Science": [("B.Sc CS", 6), ("M.Sc CS", 4), ("MCA", 4)],
-            "Zoology": [("B.Sc Zoology", 6)],
-            "Physics": [("B.Sc Physics", 6)],
-        }
-
-        course_objs = []
-        for dept in departments:
-            for course_name, sem_count in course_config.get(dept.name, []):
-                course = Course.objects.create(name=course_name, total_semesters=sem_count, department=dept)
-                course_objs.append(course)
-
-        # 3. Create Semesters for each course
-        for course in course_objs:
-            for i in range(1, course.total_semesters + 1):
-                Semester.objects.create(course=course, name=str(i))
-
-        # 4. Create Faculty for each department
-        all_faculty = []
-        for dept in departments:
-            dept_name = dept.name
-            for f_index in range(1, 3):  # Create 2 faculty members
-                fac_name = f"Dr. {dept_name} Faculty {f_index}"
-                fac_email = f"{dept_name.lower().replace(' ', '_')}_fac{f_index}@example.com"
-                faculty = Faculty.objects.create(
-                    name=fac_name,
-                    email=fac_email,
+        # Each model is inserted with one bulk_create; Postgres returns the new PKs
+        with transaction.atomic():
+            # 1. Create Departments
+            dept_names = ["Computer Science", "Zoology", "Physics"]
+            departments = Department.objects.bulk_create([Department(name=name) for name in dept_names])
+
+            # 2. Create Courses under each Department
+            course_config = {
+                "Computer Science": [("B.Sc CS", 6), ("M.Sc CS", 4), ("MCA", 4)],
+                "Zoology": [("B.Sc Zoology", 6)],
+                "Physics": [("B.Sc Physics", 6)],
+            }
+
+            course_objs = Course.objects.bulk_create([
+                Course(name=course_name, total_semesters=sem_count, department=dept)
+                for dept in departments
+                for course_name, sem_count in course_config.get(dept.name, [])
+            ])
+            courses_by_dept = defaultdict(list)
+            for course in course_objs:
+                courses_by_dept[course.department_id].append(course)
+
+            # 3. Create Semesters for each course
+            semesters = Semester.objects.bulk_create([
+                Semester(course=course, name=str(i))
+                for course in course_objs
+                for i in range(1, course.total_semesters + 1)
+            ])
+            first_semester = {}
+            for semester in semesters:
+                first_semester.setdefault(semester.course_id, semester)
+
+            # 4. Create Faculty for each department (2 per department)
+            all_faculty = Faculty.objects.bulk_create([
+                Faculty(
+                    name=f"Dr. {dept.name} Faculty {f_index}",
+                    email=f"{dept.name.lower().replace(' ', '_')}_fac{f_index}@example.com",
                     department=dept
                 )
-                # Assign faculty to all courses in their department
-                fac_courses = Course.objects.filter(department=dept)
-                faculty.courses.set(fac_courses)
-                all_faculty.append(faculty)
-
-        # 5. Create Students and Admins for each department
-        for dept in departments:
-            dept_name = dept.name
-            dept_code = ''.join([w[0].upper() for w in dept_name.split()])  # e.g., CS
-
-            # Get first course and its first semester
-            dept_courses = Course.objects.filter(department=dept).order_by("id")
-            if not dept_courses.exists():
-                continue
-            course = dept_courses.first()
-            semester = Semester.objects.filter(course=course).order_by("id").first()
-
-            # Create 2 students
-            for i in range(1, 3):
-                stu_name = f"{dept_name} Student {i}"
-                stu_email = f"{dept_name.lower().replace(' ', '_')}_student{i}@example.com"
-                enr_no = f"ENR-{dept_code}-{i}"
-                Student.objects.create(
-                    name=stu_name,
-                    email=stu_email,
-                    enrollment_number=enr_no,
-                    course=course,
-                    semester=semester,
+                for dept in departments
+                for f_index in range(1, 3)
+            ])
+            # Assign faculty to all courses in their department
+            FacultyCourse = Faculty.courses.through
+            FacultyCourse.objects.bulk_create([
+                FacultyCourse(faculty_id=faculty.id, course_id=course.id)
+                for faculty in all_faculty
+                for course in courses_by_dept[faculty.department_id]
+            ])
+
+            # 5. Create Students and Admins for each department
+            students = []
+            admins = []
+            for dept in departments:
+                dept_name = dept.name
+                dept_code = ''.join([w[0].upper() for w in dept_name.split()])  # e.g., CS
+
+                # First course and its first semester
+                dept_courses = courses_by_dept[dept.id]
+                if not dept_courses:
+                    continue
+                course = dept_courses[0]
+                semester = first_semester.get(course.id)
+
+                # 2 students
+                for i in range(1, 3):
+                    students.append(Student(
+                        name=f"{dept_name} Student {i}",
+                        email=f"{dept_name.lower().replace(' ', '_')}_student{i}@example.com",
+                        enrollment_number=f"ENR-{dept_code}-{i}",
+                        course=course,
+                        semester=semester
+                    ))
+
+                # 1 admin
+                admins.append(Admin(
+                    name=f"{dept_name} Admin",
+                    email=f"{dept_name.lower().replace(' ', '_')}_admin@example.com",
                     department=dept
-                )
+                ))
 
-            # Create 1 admin
-            admin_name = f"{dept_name} Admin"
-            admin_email = f"{dept_name.lower().replace(' ', '_')}_admin@example.com"
-            Admin.objects.create(
-                name=admin_name,
-                email=admin_email,
-                department=dept
-            )
+            Student.objects.bulk_create(students)
+            Admin.objects.bulk_create(admins)
 
         print("✅ Seeding completed.")
 
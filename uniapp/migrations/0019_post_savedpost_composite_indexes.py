@@ -0,0 +1,21 @@
+# Generated by Django 5.1.6 on 2026-10-15 22:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('uniapp', '0018_admin_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['course', 'semester', '-created_at'], name='post_course_sem_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savedpost',
+            index=models.Index(fields=['student', '-saved_at'], name='savedpost_student_saved_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.6 on 2026-10-15 22:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def restore_department_from_course(apps, schema_editor):
+    Student = apps.get_model('uniapp', 'Student')
+    Course = apps.get_model('uniapp', 'Course')
+    Student.objects.update(
+        department=Subquery(Course.objects.filter(pk=OuterRef('course_id')).values('department_id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('uniapp', '0019_post_savedpost_composite_indexes'),
+    ]
+
+    # Made nullable first so unapplying can re-add the column and backfill it from the course
+    operations = [
+        migrations.AlterField(
+            model_name='student',
+            name='department',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='uniapp.department'),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, restore_department_from_course),
+        migrations.RemoveField(
+            model_name='student',
+            name='department',
+        ),
+    ]
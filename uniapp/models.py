@@ -26,23 +26,25 @@ class Semester(models.Model):
     def __str__(self):
         return f"{self.course.name} - {self.name}"
 
+# Research major categories; these should match the categories from research_fetchers.py
+_MAJOR_CHOICES = (
+    ('Machine Learning & AI', 'Machine Learning & AI'),
+    ('Software Engineering', 'Software Engineering'),
+    ('Systems & Networks', 'Systems & Networks'),
+    ('Cybersecurity', 'Cybersecurity'),
+    ('Human-Computer Interaction', 'Human-Computer Interaction'),
+    ('Data Science & Analytics', 'Data Science & Analytics'),
+    ('Emerging Technologies', 'Emerging Technologies'),
+)
+
 class ResearchMajor(models.Model):
     """Research specialization areas that match with research paper categories"""
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True, null=True)
     
-    # These should match the categories from your research_fetchers.py
-    MAJOR_CHOICES = [
-        ('Machine Learning & AI', 'Machine Learning & AI'),
-        ('Software Engineering', 'Software Engineering'),
-        ('Systems & Networks', 'Systems & Networks'),
-        ('Cybersecurity', 'Cybersecurity'),
-        ('Human-Computer Interaction', 'Human-Computer Interaction'),
-        ('Data Science & Analytics', 'Data Science & Analytics'),
-        ('Emerging Technologies', 'Emerging Technologies'),
-    ]
+    MAJOR_CHOICES = _MAJOR_CHOICES
     
-    category = models.CharField(max_length=50, choices=MAJOR_CHOICES, unique=True)
+    category = models.CharField(max_length=50, choices=_MAJOR_CHOICES, unique=True)
     
     def __str__(self):
         return self.name
@@ -68,7 +70,11 @@ class Faculty(models.Model):
     @property
     def major_categories(self):
         """Get list of research categories for this faculty"""
-        return [major.category for major in self.majors.all()]
+        # Reuse prefetched majors when present; otherwise fetch just the one column
+        prefetched = getattr(self, '_prefetched_objects_cache', {}).get('majors')
+        if prefetched is not None:
+            return [major.category for major in prefetched]
+        return list(self.majors.values_list('category', flat=True))
 
 
 class Subject(models.Model):
@@ -86,15 +92,15 @@ class Student(models.Model):
     email = models.EmailField(unique=True)
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
     semester = models.ForeignKey(Semester, on_delete=models.CASCADE)
-    department = models.ForeignKey(Department, on_delete=models.CASCADE)
-    # You're storing both course and department, even though Course → Department already exists.
 
-# Suggestion: Drop department from Student model, and get it via:
-# student.course.department
-# This reduces denormalization and sync bugs
     def __str__(self):
         return f"{self.enrollment_number} - {self.email}"
 
+    @property
+    def department(self):
+        # Derived from the course rather than stored, so the two can't disagree
+        return self.course.department
+
     @property
     def role(self):
         return "student"
@@ -118,8 +124,31 @@ class OTPVerification(models.Model):
     otp = models.CharField(max_length=6)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at'], name='otp_created_idx'),
+        ]
+
+    TTL = datetime.timedelta(minutes=15)
+
     def is_expired(self):
-        return timezone.now() > self.created_at + datetime.timedelta(minutes=15)
+        return timezone.now() > self.created_at + self.TTL
+
+    @classmethod
+    def store(cls, email, otp):
+        """Save the email's current OTP with one INSERT ... ON CONFLICT (email) DO UPDATE."""
+        cls.objects.bulk_create(
+            [cls(email=email, otp=otp, created_at=timezone.now())],
+            update_conflicts=True,
+            unique_fields=['email'],
+            update_fields=['otp', 'created_at'],
+        )
+
+    @classmethod
+    def purge_expired(cls):
+        """Delete every expired OTP in one statement; returns the number removed."""
+        deleted, _ = cls.objects.filter(created_at__lt=timezone.now() - cls.TTL).delete()
+        return deleted
 
     def __str__(self):
         return f"{self.email} - {self.otp}"
@@ -140,9 +169,15 @@ class Post(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='post_created_idx'),
+            # Student feed / admin filter: posts for a course+semester, newest first
+            models.Index(fields=['course', 'semester', '-created_at'], name='post_course_sem_created_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.course.name} - (Sem {self.semester.name} {self.content}) - {self.subject.name if self.subject else 'General'}"
+        # FK ids only: printing a post (admin, logs, shell) must not fire lazy lookups
+        return f"Post #{self.pk} (course {self.course_id}, sem {self.semester_id})"
 
     
 class SavedPost(models.Model):
@@ -152,12 +187,16 @@ class SavedPost(models.Model):
 
     class Meta:
         unique_together = ('student', 'post')
+        indexes = [
+            models.Index(fields=['-saved_at'], name='savedpost_saved_idx'),
+            models.Index(fields=['student', '-saved_at'], name='savedpost_student_saved_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.student.email} saved {self.post.title}"
+        return f"{self.student.email} saved post {self.post_id}"
 # Your models.py is now fully updated for Option A (separate models for Student, Faculty, Admin, not inheriting from Django's User). Key updates include:
 
-# course, semester, and department fields on Student are now foreign keys.
+# course and semester fields on Student are foreign keys; department is derived from the course.
 
 # department on Admin is also a foreign key for consistency.
 
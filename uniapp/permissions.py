@@ -1,20 +1,30 @@
 from rest_framework.permissions import BasePermission
-from .views import Student 
-from .models import Student, Faculty, Admin
 
 
-    
 # ✅ This is safe, explicit, and works perfectly with your custom authentication setup.
 
-class IsStudent(BasePermission):
-    def has_permission(self, request, view):
-        return hasattr(request.user, "user_type") and request.user.user_type == "student"
+_SENTINEL = object()
 
-class IsFaculty(BasePermission):
-    def has_permission(self, request, view):
-        return hasattr(request.user, "user_type") and request.user.user_type == "faculty"
+def _user_type(request):
+    """user_type of the authenticated user, memoized on the request for repeat checks."""
+    user_type = getattr(request, "_cached_user_type", _SENTINEL)
+    if user_type is _SENTINEL:
+        user_type = getattr(request.user, "user_type", None)
+        request._cached_user_type = user_type
+    return user_type
+
+class _RolePermission(BasePermission):
+    """Allows access when the authenticated user's user_type matches `role`."""
+    role = None
 
-class IsAdmin(BasePermission):
     def has_permission(self, request, view):
-        return hasattr(request.user, "user_type") and request.user.user_type == "admin"
-    
\ No newline at end of file
+        return _user_type(request) == self.role
+
+class IsStudent(_RolePermission):
+    role = "student"
+
+class IsFaculty(_RolePermission):
+    role = "faculty"
+
+class IsAdmin(_RolePermission):
+    role = "admin"
@@ -1,8 +1,14 @@
+from django.contrib.auth.models import User
 from rest_framework import serializers
-from .models import Course, Semester, Department
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.exceptions import InvalidToken
+from .models import Course, Semester, Department, Post, SavedPost
+
+USER_TYPES = ("student", "faculty", "admin")
 
 class OTPRequestSerializer(serializers.Serializer):
-    user_type = serializers.ChoiceField(choices=["student", "faculty", "admin"])
+    user_type = serializers.ChoiceField(choices=USER_TYPES)
     email = serializers.EmailField()
     enrollment_number = serializers.CharField(required=False, allow_blank=True)
     department = serializers.CharField(required=False, allow_blank=True)
@@ -10,51 +16,46 @@ class OTPRequestSerializer(serializers.Serializer):
 class OTPVerifySerializer(serializers.Serializer):
     email = serializers.EmailField()
     otp = serializers.CharField(max_length=6)
-    user_type = serializers.ChoiceField(choices=[("student", "student"), ("faculty", "faculty"), ("admin", "admin")])
+    user_type = serializers.ChoiceField(choices=USER_TYPES)
 
-# serializers.py
-
-from rest_framework_simplejwt.serializers import TokenRefreshSerializer
-from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
-from rest_framework_simplejwt.exceptions import InvalidToken
-from django.contrib.auth.models import User
+def user_is_active(user_id):
+    # Checked on every refresh, not cached, so deactivation takes effect at once
+    return User.objects.filter(id=user_id, is_active=True).exists()
 
 class CustomTokenRefreshSerializer(TokenRefreshSerializer):
     def validate(self, attrs):
-        # The default validation checks the token's signature and expiration.
-        data = super().validate(attrs)
-        
-        # Decode the refresh token to access its claims.
-        refresh = RefreshToken(attrs['refresh'])
-        
+        # Decode and verify the refresh token once. Calling super().validate()
+        # first decoded it, blacklisted it on rotation, and the second decode
+        # here then failed as blacklisted.
+        refresh = self.token_class(attrs['refresh'])
+
         user_id = refresh.get('user_id')
-        email = refresh.get('email')
-        user_type = refresh.get('user_type')
-
-        # --- THIS IS THE FIX ---
-        # Find the user associated with the token. If they don't exist or are
-        # inactive, the token is invalid.
-        try:
-            user = User.objects.get(id=user_id, is_active=True)
-        except User.DoesNotExist:
+
+        # If the token's user doesn't exist or is inactive, the token is invalid.
+        # Only the yes/no matters, so no User row is loaded
+        if not user_id or not user_is_active(user_id):
             raise InvalidToken('User not found for the given token.')
 
-        # Create a new access token for the *correct* user.
-        new_access_token = AccessToken.for_user(user)
-        
-        # Re-inject the custom claims into the new access token.
-        new_access_token['email'] = email
-        new_access_token['user_type'] = user_type
-        
-        data['access'] = str(new_access_token)
+        # access_token copies every claim except the token bookkeeping ones,
+        # so email and user_type carry over without re-injecting them
+        data = {'access': str(refresh.access_token)}
 
-        return data
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    # token_blacklist app not installed
+                    pass
 
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
 
-from .models import Post, SavedPost
+            data['refresh'] = str(refresh)
+
+        return data
 
-from rest_framework import serializers
-from .models import Post
 
 class PostSerializer(serializers.ModelSerializer):
     course_name = serializers.CharField(source='course.name', read_only=True)
@@ -65,9 +66,10 @@ class PostSerializer(serializers.ModelSerializer):
     document_url = serializers.URLField(write_only=True , required=False, allow_null=True)
     image_url = serializers.URLField(write_only=True, required=False, allow_null=True)
     # add urls fields to fetch document and image from supabase storage (used during GET)  
-      # Read-only URLs (return to frontend)
-    document = serializers.CharField(read_only=True)
-    image = serializers.CharField(read_only=True)
+      # Read-only URLs (return to frontend); stored absolute at upload time, so
+      # they render straight from the column
+    document = serializers.URLField(read_only=True)
+    image = serializers.URLField(read_only=True)
     
     is_saved = serializers.SerializerMethodField()
   
@@ -76,6 +78,17 @@ class PostSerializer(serializers.ModelSerializer):
         fields = '__all__' 
         read_only_fields = ['faculty', 'created_at'] # 👈 Prevent frontend from sending iT
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the FKs behind course_name/semester_name/department_name.
+
+        fields = '__all__' renders every Post column, so only the joined
+        tables' unused columns are deferred.
+        """
+        return queryset.select_related('course', 'semester', 'department').defer(
+            'course__department', 'course__total_semesters', 'semester__course',
+        )
+
     # add methods below,to GET document and image from supabase storage urls
 
 
@@ -95,8 +108,8 @@ class PostSerializer(serializers.ModelSerializer):
         return instance
     
     def get_is_saved(self, obj):
-        saved_ids = self.context.get('saved_ids', set())
-        return obj.id in saved_ids
+        # Annotated by the student feed (Exists subquery); other lists never mark posts saved
+        return getattr(obj, 'is_saved', False)
     
 class DepartmentSerializer(serializers.ModelSerializer):
     class Meta:
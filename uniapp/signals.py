@@ -1,6 +1,9 @@
-from django.db.models.signals import post_delete
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from uniapp.models import Post
+from django.core.cache import cache
+from uniapp.models import Post, Department
+from uniapp.utils import department_cache_key, DEPARTMENT_LIST_CACHE_KEY
 from django.conf import settings
 from supabase import create_client
 
@@ -10,17 +13,43 @@ SUPABASE_SERVICE_KEY = settings.SUPABASE_SERVICE_KEY
 supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
 
 def extract_supabase_path(url):
-    parts = url.split('/media-unipulse/')
-    if len(parts) == 2:
-        return parts[1]
-    return None
+    _, sep, path = url.partition('/media-unipulse/')
+    return path if sep else None
+
+class _AttachmentBatch:
+    """on_commit callback removing every attachment queued in one (sub)transaction."""
+    def __init__(self):
+        self.paths = []
+
+    def __call__(self):
+        supabase.storage.from_("media-unipulse").remove(self.paths)
 
 @receiver(post_delete, sender=Post)
 def delete_post_attachments(sender, instance, **kwargs):
-    doc_path = extract_supabase_path(instance.document) if instance.document else None
-    img_path = extract_supabase_path(instance.image) if instance.image else None
+    paths = [
+        extract_supabase_path(url)
+        for url in (instance.document, instance.image) if url
+    ]
+    paths = [path for path in paths if path]
+    if not paths:
+        return
+
+    # Files go once the delete commits, so a rolled-back delete keeps them and
+    # a bulk delete of K posts makes one storage request. Deletes join the batch
+    # already pending for the same savepoint; a savepoint rollback drops it whole
+    connection = transaction.get_connection()
+    savepoint_ids = set(connection.savepoint_ids)
+    for entry in connection.run_on_commit:
+        if isinstance(entry[1], _AttachmentBatch) and entry[0] == savepoint_ids:
+            entry[1].paths.extend(paths)
+            return
+    batch = _AttachmentBatch()
+    batch.paths.extend(paths)
+    transaction.on_commit(batch)
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def invalidate_department_cache(sender, instance, **kwargs):
+    cache.delete_many([department_cache_key(instance.name), DEPARTMENT_LIST_CACHE_KEY])
 
-    if doc_path:
-        supabase.storage.from_("media-unipulse").remove([doc_path])
-    if img_path:
-        supabase.storage.from_("media-unipulse").remove([img_path])
@@ -0,0 +1,25 @@
+"""
+Background work for UniPulse views, run through uniBackend.background.enqueue.
+"""
+import time
+from smtplib import SMTPException
+
+from django.core.mail import send_mail
+
+
+def send_otp_email(email, otp_code, attempts=3):
+    # SMTP hiccups are retried with backoff here rather than failing the request
+    for attempt in range(attempts):
+        try:
+            send_mail(
+                "Your UniPulse OTP Code",
+                f"Your OTP is {otp_code}. It is valid for 15 minutes.",
+                "no-reply@unipulse.com",
+                [email],
+                fail_silently=False,
+            )
+            return
+        except SMTPException:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(2 ** attempt)
@@ -1,3 +1,207 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+import version
+
+from .models import Course, Department, Faculty, OTPVerification, Post, SavedPost, Semester, Student
+
+
+def make_student(email="student@example.com"):
+    department = Department.objects.create(name="Computer Science")
+    course = Course.objects.create(name="B.Sc CS", department=department)
+    semester = Semester.objects.create(course=course, name="1")
+    return Student.objects.create(
+        name="Student", enrollment_number="CS001", email=email,
+        course=course, semester=semester,
+    )
+
+
+def bearer(profile, user_type):
+    token = AccessToken()
+    token['email'] = profile.email
+    token['user_type'] = user_type
+    return f"Bearer {token}"
+
+
+def make_post(student):
+    faculty = Faculty.objects.create(email="faculty@example.com", department=student.course.department)
+    return Post.objects.create(
+        faculty=faculty, content="Notes", department=faculty.department,
+        course=student.course, semester=student.semester,
+    )
+
+
+class VerifyOTPViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.student = make_student()
+        OTPVerification.store(self.student.email, "123456")
+
+    def verify(self, otp):
+        return self.client.post(
+            reverse('verify-otp'),
+            {'email': self.student.email, 'otp': otp, 'user_type': 'student'},
+            format='json',
+        )
+
+    def test_valid_otp_issues_tokens_and_is_consumed(self):
+        response = self.verify("123456")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access_token', response.data)
+        self.assertIn('refresh_token', response.data)
+        self.assertFalse(OTPVerification.objects.filter(email=self.student.email).exists())
+
+    def test_otp_cannot_be_used_twice(self):
+        self.assertEqual(self.verify("123456").status_code, 200)
+        self.assertEqual(self.verify("123456").status_code, 400)
+
+    def test_wrong_otp_is_rejected_and_kept(self):
+        self.assertEqual(self.verify("654321").status_code, 400)
+        self.assertTrue(OTPVerification.objects.filter(email=self.student.email).exists())
+
+    def test_expired_otp_is_rejected(self):
+        OTPVerification.objects.filter(email=self.student.email).update(
+            created_at=timezone.now() - OTPVerification.TTL - timedelta(seconds=1)
+        )
+        self.assertEqual(self.verify("123456").status_code, 400)
+
+
+class OTPVerificationStoreTests(TestCase):
+    def test_store_inserts_then_replaces_the_emails_code(self):
+        OTPVerification.store("a@example.com", "111111")
+        first = OTPVerification.objects.get(email="a@example.com")
+        OTPVerification.objects.filter(pk=first.pk).update(created_at=timezone.now() - timedelta(minutes=10))
+
+        OTPVerification.store("a@example.com", "222222")
+
+        row = OTPVerification.objects.get(email="a@example.com")
+        self.assertEqual(OTPVerification.objects.filter(email="a@example.com").count(), 1)
+        self.assertEqual(row.otp, "222222")
+        # Re-issuing restarts the TTL
+        self.assertFalse(row.is_expired())
+        self.assertGreater(row.created_at, timezone.now() - timedelta(minutes=1))
+
+
+class OTPVerificationPurgeTests(TestCase):
+    def setUp(self):
+        OTPVerification.store("fresh@example.com", "111111")
+        OTPVerification.store("stale@example.com", "222222")
+        OTPVerification.objects.filter(email="stale@example.com").update(
+            created_at=timezone.now() - OTPVerification.TTL - timedelta(seconds=1)
+        )
+
+    def test_purge_expired_removes_only_expired_codes(self):
+        self.assertEqual(OTPVerification.purge_expired(), 1)
+        self.assertEqual(
+            list(OTPVerification.objects.values_list('email', flat=True)), ["fresh@example.com"]
+        )
+
+    def test_purge_command(self):
+        call_command('purge_expired_otps', stdout=StringIO())
+        self.assertFalse(OTPVerification.objects.filter(email="stale@example.com").exists())
+        self.assertTrue(OTPVerification.objects.filter(email="fresh@example.com").exists())
+
+
+class ToggleSavePostViewTests(TestCase):
+    def setUp(self):
+        self.student = make_student()
+        self.post = make_post(self.student)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.student, 'student'))
+
+    def toggle(self, post_id):
+        return self.client.post(reverse('save-post'), {'post_id': post_id}, format='json')
+
+    def test_first_toggle_saves_and_second_unsaves(self):
+        response = self.toggle(self.post.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['message'], "Post saved")
+        self.assertTrue(SavedPost.objects.filter(student=self.student, post=self.post).exists())
+
+        response = self.toggle(self.post.id)
+        self.assertEqual(response.data['message'], "Post unsaved")
+        self.assertFalse(SavedPost.objects.filter(student=self.student).exists())
+
+    def test_malformed_post_id_is_404(self):
+        self.assertEqual(self.toggle("abc").status_code, 404)
+
+    def test_missing_post_id_is_400(self):
+        self.assertEqual(self.client.post(reverse('save-post'), {}, format='json').status_code, 400)
+
+
+class ToggleSaveMissingPostTests(TransactionTestCase):
+    # The FK check is deferred to commit, which only happens outside TestCase's wrapping transaction
+
+    def test_missing_post_is_404(self):
+        student = make_student()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=bearer(student, 'student'))
+        response = client.post(reverse('save-post'), {'post_id': 999999}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(SavedPost.objects.exists())
+
+
+class CustomTokenRefreshTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(username="student@example.com", email="student@example.com")
+        self.refresh = RefreshToken.for_user(self.user)
+        self.refresh['email'] = self.user.email
+        self.refresh['user_type'] = 'student'
+
+    def refresh_with(self, token):
+        return self.client.post(reverse('token_refresh'), {'refresh': str(token)}, format='json')
+
+    def test_refresh_rotates_and_keeps_custom_claims(self):
+        response = self.refresh_with(self.refresh)
+        self.assertEqual(response.status_code, 200)
+
+        access = AccessToken(response.data['access'])
+        rotated = RefreshToken(response.data['refresh'])
+        for token in (access, rotated):
+            self.assertEqual(token['email'], self.user.email)
+            self.assertEqual(token['user_type'], 'student')
+        self.assertNotEqual(rotated['jti'], self.refresh['jti'])
+
+        # The old refresh token was blacklisted on rotation
+        self.assertEqual(self.refresh_with(self.refresh).status_code, 401)
+        self.assertEqual(self.refresh_with(rotated).status_code, 200)
+
+    def test_inactive_or_deleted_user_cannot_refresh(self):
+        self.user.is_active = False
+        self.user.save(update_fields=['is_active'])
+        self.assertEqual(self.refresh_with(self.refresh).status_code, 401)
+
+        token = RefreshToken.for_user(self.user)
+        self.user.delete()
+        self.assertEqual(self.refresh_with(token).status_code, 401)
+
+
+class VersionScriptTests(SimpleTestCase):
+    """The release script (version.py at the repository root)."""
+
+    def test_parse_version(self):
+        self.assertEqual(version.parse_version("v1.2.30"), (1, 2, 30))
+        for tag in ("1.2.3", "v1.2", "v1.2.3-rc1", "release", ""):
+            self.assertIsNone(version.parse_version(tag))
+
+    def test_latest_tag_compares_numerically_and_skips_other_tags(self):
+        tags = ["v0.1.9", "v0.1.10", "v0.0.3", "nightly", "v1.0"]
+        self.assertEqual(version.get_latest_tag(tags), "v0.1.10")
+        self.assertEqual(version.get_latest_tag(["nightly"]), "v0.0.0")
+        self.assertEqual(version.get_latest_tag([]), "v0.0.0")
+
+    def test_bump_version(self):
+        self.assertEqual(version.bump_version("v1.2.3", "major"), "v2.0.0")
+        self.assertEqual(version.bump_version("v1.2.3", "minor"), "v1.3.0")
+        self.assertEqual(version.bump_version("v1.2.3", "patch"), "v1.2.4")
+        with self.assertRaises(ValueError):
+            version.bump_version("nightly", "patch")
@@ -1,28 +1,25 @@
-import random
-from django.core.mail import send_mail
-from django.utils.timezone import now
+from secrets import randbelow
+import hashlib
+from django.core.cache import cache
+from django.db import transaction
 from .models import OTPVerification
+from .tasks import send_otp_email
+from uniBackend.background import enqueue
 from .models import Student, Faculty, Admin, Department
 
 def generate_otp():
     """Generate a 6-digit OTP."""
-    return str(random.randint(100000, 999999))
+    return f"{randbelow(900000) + 100000:06d}"
 
 def send_otp(email):
     """Generate and send OTP to the user."""
     otp_code = generate_otp()
 
     # Store OTP (overwrite if exists)
-    OTPVerification.objects.update_or_create(email=email, defaults={"otp": otp_code, "created_at": now()})
+    OTPVerification.store(email, otp_code)
 
-    # Send OTP via email
-    send_mail(
-        subject="Your UniPulse Login OTP",
-        message=f"Your OTP is: {otp_code}. It expires in 15 minutes.",
-        from_email="your-email@gmail.com",
-        recipient_list=[email],
-        fail_silently=False,
-    )
+    # Send OTP via email once the row is committed, off the request thread
+    transaction.on_commit(lambda: enqueue(send_otp_email, email, otp_code))
 
 from django.core.exceptions import ObjectDoesNotExist
  
@@ -32,9 +29,32 @@ from rest_framework.exceptions import ValidationError, NotFound
 
 from rest_framework.exceptions import ValidationError, NotFound
 
+# Departments barely change; uniapp.signals drops an entry when its department
+# is saved or deleted, the timeout covers renames
+DEPARTMENT_CACHE_TIMEOUT = 300
+
+# Serialized DepartmentListView payload, dropped by the same signal
+DEPARTMENT_LIST_CACHE_KEY = "dept:list"
+DEPARTMENT_LIST_CACHE_TIMEOUT = 60 * 15
+
+
+def department_cache_key(name):
+    return "dept:" + hashlib.sha1(name.lower().encode()).hexdigest()[:16]
+
+def get_department_id(name):
+    """Case-insensitive department lookup by name; returns the pk or None."""
+    key = department_cache_key(name)
+    dept_id = cache.get(key)
+    if dept_id is None:
+        dept_id = Department.objects.filter(name__iexact=name).values_list("id", flat=True).first()
+        if dept_id is not None:
+            cache.set(key, dept_id, DEPARTMENT_CACHE_TIMEOUT)
+    return dept_id
+
 def get_user_by_type_and_details(user_type, email, enrollment_number=None, department_name=None):
+    # Callers only check the profile exists, so load just the matched columns
     if user_type == "student":
-        user = Student.objects.filter(email=email, enrollment_number=enrollment_number).first()
+        user = Student.objects.only("id", "email", "enrollment_number").filter(email=email, enrollment_number=enrollment_number).first()
         if not user:
             raise NotFound("Student not found with provided email and enrollment number.")
         return user
@@ -43,13 +63,11 @@ def get_user_by_type_and_details(user_type, email, enrollment_number=None, depar
         if not department_name:
             raise ValidationError("Department is required for faculty.")
         
-        # Get the department instance
-        try:
-            dept = Department.objects.get(name__iexact=department_name)
-        except Department.DoesNotExist:
+        dept_id = get_department_id(department_name)
+        if dept_id is None:
             raise ValidationError("Invalid department name.")
 
-        user = Faculty.objects.filter(email=email, department=dept).first()
+        user = Faculty.objects.only("id", "email", "department_id").filter(email=email, department_id=dept_id).first()
         if not user:
             raise ValidationError("Faculty with this email is not associated with the specified department.")
         return user
@@ -58,12 +76,11 @@ def get_user_by_type_and_details(user_type, email, enrollment_number=None, depar
         if not department_name:
             raise ValidationError("Department is required for admin.")
 
-        try:
-            dept = Department.objects.get(name__iexact=department_name)
-        except Department.DoesNotExist:
+        dept_id = get_department_id(department_name)
+        if dept_id is None:
             raise ValidationError("Invalid department name.")
 
-        user = Admin.objects.filter(email=email, department=dept).first()
+        user = Admin.objects.only("id", "email", "department_id").filter(email=email, department_id=dept_id).first()
         if not user:
             raise ValidationError("Admin with this email is not associated with the specified department.")
         return user
@@ -1,7 +1,6 @@
-import random
 import datetime
 from django.utils import timezone
-from django.core.mail import send_mail
+from django.db import transaction, IntegrityError, DataError
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -11,21 +10,24 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework_simplejwt.views import TokenRefreshView
 from .serializers import CustomTokenRefreshSerializer
 from .models import (
-    Student, Faculty, Admin, OTPVerification, Course,
-    Semester, Department, Post, SavedPost
+    OTPVerification, Course, Semester, Department, Post, SavedPost
 )
 from .serializers import (
     OTPRequestSerializer, OTPVerifySerializer, CourseSerializer,
-    SemesterSerializer, PostSerializer, DepartmentSerializer
+    PostSerializer, DepartmentSerializer
 )
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User
 #from .tokens import generate_custom_tokens
 from .permissions import IsStudent, IsFaculty, IsAdmin
-from .authentication import CustomJWTAuthentication
+from .authentication import CustomJWTAuthentication, USER_MODELS
 from django.core.exceptions import ObjectDoesNotExist
 from rest_framework.exceptions import ValidationError, NotFound
-from .utils import get_user_by_type_and_details
+from .tasks import send_otp_email
+from uniBackend.background import enqueue
+from .utils import get_user_by_type_and_details, generate_otp, DEPARTMENT_LIST_CACHE_KEY, DEPARTMENT_LIST_CACHE_TIMEOUT
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Value
 
 
 class RequestOTPView(APIView):
@@ -49,19 +51,11 @@ class RequestOTPView(APIView):
             except (ValidationError, NotFound) as e:
                 return Response({"error": str(e.detail)}, status=e.status_code)
 
-            otp = random.randint(100000, 999999)
-            OTPVerification.objects.update_or_create(
-                email=email,
-                defaults={"otp": otp, "created_at": timezone.now()}
-            )
+            otp = generate_otp()
+            OTPVerification.store(email, otp)
 
-            send_mail(
-                "Your UniPulse OTP Code",
-                f"Your OTP is {otp}. It is valid for 5 minutes.",
-                "no-reply@unipulse.com",
-                [email],
-                fail_silently=False,
-            )
+            # Sent from the background pool so the response doesn't wait on SMTP
+            transaction.on_commit(lambda: enqueue(send_otp_email, email, otp))
 
             return Response({"message": "OTP sent successfully"}, status=status.HTTP_200_OK)
 
@@ -79,20 +73,19 @@ class VerifyOTPView(APIView):
             otp = serializer.validated_data["otp"]
             user_type = serializer.validated_data["user_type"]
 
-            otp_entry = OTPVerification.objects.filter(email=email, otp=str(otp)).first()
+            # Check and consume in one statement: expiry is tested in SQL against the
+            # unique email index, and a code can't be used twice concurrently
+            consumed, _ = OTPVerification.objects.filter(
+                email=email,
+                otp=str(otp),
+                created_at__gte=timezone.now() - OTPVerification.TTL,
+            ).delete()
 
-            if not otp_entry or otp_entry.is_expired():
+            if not consumed:
                 return Response({"error": "Invalid or expired OTP"}, status=400)
 
-            # OTP is valid, delete it
-            otp_entry.delete()
-
             # Get actual user from your model
-            user_model = {
-                "student": Student,
-                "faculty": Faculty,
-                "admin": Admin
-            }.get(user_type)
+            user_model = USER_MODELS.get(user_type)
 
             if not user_model:
                 return Response({"error": "Invalid user type"}, status=400)
@@ -129,9 +122,14 @@ class CustomTokenRefreshView(TokenRefreshView):# ask if its okay to make this en
     permission_classes = [AllowAny]
     serializer_class = CustomTokenRefreshSerializer
 
-from rest_framework.pagination import PageNumberPagination
-class StudentPostPagination(PageNumberPagination):
+from rest_framework.pagination import CursorPagination
+class PostCursorPagination(CursorPagination):
+    # Keyset pagination over the (course, semester, -created_at) index; deep pages
+    # cost the same as the first
     page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
 
 
 class StudentPostListView(APIView):
@@ -143,28 +141,26 @@ class StudentPostListView(APIView):
         saved_only = request.query_params.get('saved') == 'true' # optional filtering for saved posts (via ?saved=true),to on saved post screen
 
         if saved_only:
+            # Reverse-FK filter: an INNER JOIN on savedpost, not an IN (SELECT ...);
+            # (student, post) is unique so the join cannot duplicate posts
             post_queryset = Post.objects.filter(
-                id__in=SavedPost.objects.filter(student=student).values_list('post_id', flat=True)
-            )
+                savedpost__student=student
+            ).annotate(is_saved=Value(True))
         else:
             post_queryset = Post.objects.filter(
                 course=student.course,
                 semester=student.semester
+            ).annotate(
+                # The DB answers "saved?" per row instead of us loading every saved id
+                is_saved=Exists(SavedPost.objects.filter(student=student, post=OuterRef('pk')))
             )
 
-        post_queryset = post_queryset.order_by('-created_at')
+        post_queryset = PostSerializer.setup_eager_loading(post_queryset)
 
-        paginator = StudentPostPagination()
+        paginator = PostCursorPagination()
         page = paginator.paginate_queryset(post_queryset, request)
 
-        # Pre-fetch saved IDs to pass into serializer context
-        saved_ids = set(SavedPost.objects.filter(student=student).values_list('post_id', flat=True))
-
-        serializer = PostSerializer(
-            page,
-            many=True,
-            context={'request': request, 'saved_ids': saved_ids}
-        )
+        serializer = PostSerializer(page, many=True, context={'request': request})
 
         return paginator.get_paginated_response(serializer.data)    
     
@@ -180,17 +176,22 @@ class ToggleSavePostView(APIView):
         if not post_id:
             return Response({"error": "Post ID is required"}, status=400)
 
+        # Unsave is a single DELETE; only if nothing was deleted do we save
         try:
-            post = Post.objects.get(id=post_id)
-        except Post.DoesNotExist:
+            deleted, _ = SavedPost.objects.filter(student=student, post_id=post_id).delete()
+        except ValueError:
             return Response({"error": "Post not found"}, status=404)
 
-        saved_post, created = SavedPost.objects.get_or_create(student=student, post=post)
-
-        if not created:
-            saved_post.delete()
+        if deleted:
             return Response({"message": "Post unsaved"}, status=200)
 
+        # INSERT ... ON CONFLICT DO NOTHING; the post FK stands in for the existence check
+        try:
+            with transaction.atomic():
+                SavedPost.objects.bulk_create([SavedPost(student=student, post_id=post_id)], ignore_conflicts=True)
+        except (IntegrityError, DataError):
+            return Response({"error": "Post not found"}, status=404)
+
         return Response({"message": "Post saved"})
 
 
@@ -212,10 +213,9 @@ class FacultyPostListView(APIView):
         if semester_id and semester_id.lower() not in ['none', 'null']:
             posts = posts.filter(semester__id=semester_id)
 
-        posts = posts.order_by('-created_at')
+        posts = PostSerializer.setup_eager_loading(posts)
 
-        paginator = PageNumberPagination()
-        paginator.page_size = request.query_params.get('page_size', 10)
+        paginator = PostCursorPagination()
         paginated_posts = paginator.paginate_queryset(posts, request)
 
         serializer = PostSerializer(paginated_posts, many=True, context={'request': request})
@@ -235,8 +235,9 @@ class FacultyPostCreateView(APIView):
 
         serializer = PostSerializer(data=data, context={'request': request})
         if serializer.is_valid():
-            post = serializer.save(faculty=faculty, department=faculty.department)
-            return Response(PostSerializer(post, context={'request': request}).data, status=201)
+            serializer.save(faculty=faculty, department=faculty.department)
+            # .data renders the saved instance; no need for a second serializer
+            return Response(serializer.data, status=201)
         return Response(serializer.errors, status=400)
 
 
@@ -261,7 +262,7 @@ class FacultyCoursesAPIView(APIView):#for faculty dashboard ,This lets the front
 
     def get(self, request):
         faculty = request.user.profile
-        courses = faculty.courses.all()
+        courses = faculty.courses.only('id', 'name', 'department_id')
         serializer = CourseSerializer(courses, many=True)
         return Response(serializer.data)
 
@@ -270,18 +271,22 @@ class SemestersByCourseAPIView(APIView):#for faculty dashboard
     permission_classes = [IsAuthenticated]
 
     def get(self, request, course_id):
-        semesters = Semester.objects.filter(course_id=course_id)
-        if not semesters.exists():# check if the course exists to avoid unnecessary 500 errors
+        # Read-only rows in SemesterSerializer's shape; one query, no model instances
+        semesters = list(Semester.objects.filter(course_id=course_id).values('id', 'name', 'course'))
+        if not semesters:# check if the course exists to avoid unnecessary 500 errors
          return Response({'detail': 'No semesters found for this course.'}, status=404)
-        serializer = SemesterSerializer(semesters, many=True)
-        return Response(serializer.data)
+        return Response(semesters)
     
 class DepartmentListView(APIView):
     permission_classes = [AllowAny]
     def get(self, request):
-        departments = Department.objects.all()
-        serializer = DepartmentSerializer(departments, many=True)
-        return Response(serializer.data)    
+        # Public and rarely changing: serve the serialized list from cache
+        data = cache.get_or_set(
+            DEPARTMENT_LIST_CACHE_KEY,
+            lambda: DepartmentSerializer(Department.objects.all(), many=True).data,
+            DEPARTMENT_LIST_CACHE_TIMEOUT,
+        )
+        return Response(data)    
 # if returning hundreds of entries,add pagination later — but for now, this gives a clean list.    
 
 
@@ -293,7 +298,7 @@ class FacultyMajorsAPIView(APIView):
         """Get research majors for the authenticated faculty member."""
         try:
             faculty = request.user.profile  # This uses your custom authentication
-            majors = [major.category for major in faculty.majors.all()]
+            majors = faculty.major_categories  # category strings straight from values_list
             return Response({'majors': majors})
         except Exception as e:
             return Response({'majors': [], 'error': str(e)}, status=500)
\ No newline at end of file
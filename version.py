@@ -3,15 +3,39 @@ import re
 from datetime import datetime
 import sys
 
-def get_latest_tag():
-    result = subprocess.run(["git", "tag"], capture_output=True, text=True)
-    tags = result.stdout.strip().split("\n")
-    if not tags or tags == ['']:
+def read_refs():
+    """Current branch and all tag names, from a single `git for-each-ref` call."""
+    result = subprocess.run(
+        ["git", "for-each-ref", "--format=%(HEAD)%(refname)", "refs/heads", "refs/tags"],
+        capture_output=True, text=True,
+    )
+    branch, tags = "", []
+    for line in result.stdout.splitlines():
+        is_head, ref = line[0] == "*", line[1:]
+        if ref.startswith("refs/tags/"):
+            tags.append(ref[len("refs/tags/"):])
+        elif is_head:
+            branch = ref[len("refs/heads/"):]
+    return branch, tags
+
+_VER_RE = re.compile(r"^v(\d+)\.(\d+)\.(\d+)$")
+
+def parse_version(tag):
+    """(major, minor, patch) for a `vX.Y.Z` tag, or None if the tag is not in that form."""
+    m = _VER_RE.match(tag)
+    return tuple(map(int, m.groups())) if m else None
+
+def get_latest_tag(tags):
+    versions = [(v, tag) for tag in tags if (v := parse_version(tag))]
+    if not versions:
         return "v0.0.0"
-    return sorted(tags, key=lambda s: list(map(int, s[1:].split("."))))[-1]
+    return max(versions)[1]
 
 def bump_version(tag, part):
-    major, minor, patch = map(int, tag[1:].split("."))
+    version = parse_version(tag)
+    if version is None:
+        raise ValueError(f"Not a vX.Y.Z tag: {tag!r}")
+    major, minor, patch = version
     if part == "major":
         major += 1
         minor = 0
@@ -28,17 +52,29 @@ def generate_changelog(since_tag):
     result = subprocess.run(log_cmd, capture_output=True, text=True)
     return result.stdout.strip()
 
+CHANGELOG_TAIL_BYTES = 4096
+
+def append_changelog(entry, tag):
+    """Append `entry` to CHANGELOG.md unless `tag` already heads one of its recent sections.
+
+    Only the last CHANGELOG_TAIL_BYTES are read, so the check costs the same on any size of file.
+    """
+    with open("CHANGELOG.md", "a+b") as f:
+        size = f.seek(0, 2)
+        f.seek(max(0, size - CHANGELOG_TAIL_BYTES))
+        tail = f.read().decode("utf-8", "ignore")
+        if f"## {tag} -" in tail:
+            return False
+        f.write(entry.encode("utf-8"))
+    return True
+
 def update_version_file(version):
     with open("version.txt", "w") as f:
         f.write(version)
 
-def get_current_branch():
-    result = subprocess.run(["git", "rev-parse", "--abbrev-ref", "HEAD"], capture_output=True, text=True)
-    return result.stdout.strip()        
-
 def main():
     allowed_branches = ["main"] #to prevent accidental tagging on other branches, add branch to tag
-    current_branch = get_current_branch()
+    current_branch, tags = read_refs()
 
     if not any(current_branch.startswith(prefix) for prefix in allowed_branches):
         print(f"🚫 Tagging is restricted. Current branch: '{current_branch}'.")
@@ -49,7 +85,7 @@ def main():
     if len(sys.argv) == 2 and sys.argv[1] in ["major", "minor", "patch"]:
         part = sys.argv[1]
 
-    current_tag = get_latest_tag()
+    current_tag = get_latest_tag(tags)
     new_tag = bump_version(current_tag, part)
     changelog = generate_changelog(current_tag)
 
@@ -60,17 +96,19 @@ def main():
     today = datetime.today().strftime("%Y-%m-%d")
     entry = f"\n\n## {new_tag} - {today}\n{changelog}\n"
 
-    with open("CHANGELOG.md", "a") as f:
-        f.write(entry)
+    if not append_changelog(entry, new_tag):
+        print(f"❌ CHANGELOG.md already has an entry for {new_tag}.")
+        sys.exit(1)
 
     update_version_file(new_tag)    
 
-    subprocess.run(["git", "add", "CHANGELOG.md"])
-    subprocess.run(["git", "add", "version.txt"])
+    subprocess.run(["git", "add", "CHANGELOG.md", "version.txt"])
     subprocess.run(["git", "commit", "-m", f"chore: release {new_tag}"])
     subprocess.run(["git", "tag", new_tag])
-    subprocess.run(["git", "push"])
-    subprocess.run(["git", "push", "--tags"])
+    # One atomic push for the release commit and its tag: a single round trip, and neither lands without the other.
+    if subprocess.run(["git", "push", "--atomic", "origin", "HEAD", f"refs/tags/{new_tag}"]).returncode:
+        print(f"❌ Push failed; {new_tag} was created locally only.")
+        sys.exit(1)
 
     print(f"✅ Released {new_tag}") 
 